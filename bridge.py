@@ -34,22 +34,26 @@ class MessageTracker:
         self.lock = Lock()
         self.message_log = []
 
-    def add_message(self, msg_id, from_node, to_node, text, channel):
+    def add_message(self, msg_id, from_node, to_node, text, channel, timestamp=None):
         """Add a message to the tracker"""
         with self.lock:
-            entry = {
-                'id': msg_id,
-                'from': from_node,
-                'to': to_node,
-                'text': text,
-                'channel': channel,
-                'timestamp': datetime.now(),
-                'forwarded': False
-            }
-            self.messages.append(entry)
-            self.message_log.append(entry)
+            return self._append(msg_id, from_node, to_node, text, channel, timestamp)
+
+    def check_and_add(self, msg_id, from_node, to_node, text, channel, timestamp=None):
+        """
+        Add a message unless it is already tracked
+
+        The check and the insert happen under one lock, so concurrent
+        callers cannot both claim the same message.
+
+        Returns:
+            The new entry, or None if the message was already seen
+        """
+        with self.lock:
             self._cleanup()
-            return entry
+            if any(msg['id'] == msg_id for msg in self.messages):
+                return None
+            return self._append(msg_id, from_node, to_node, text, channel, timestamp)
 
     def has_seen(self, msg_id):
         """Check if we've already seen this message"""
@@ -66,6 +70,25 @@ class MessageTracker:
                     return True
             return False
 
+    def _append(self, msg_id, from_node, to_node, text, channel, timestamp):
+        """Record a message (caller holds the lock)"""
+        if timestamp is None:
+            timestamp = datetime.now()
+
+        entry = {
+            'id': msg_id,
+            'from': from_node,
+            'to': to_node,
+            'text': text,
+            'channel': channel,
+            'timestamp': timestamp,
+            'forwarded': False
+        }
+        self.messages.append(entry)
+        self.message_log.append(entry)
+        self._cleanup()
+        return entry
+
     def _cleanup(self):
         """Remove old messages"""
         cutoff = datetime.now() - self.max_age
@@ -77,6 +100,24 @@ class MessageTracker:
         with self.lock:
             return list(self.messages)[-count:]
 
+    def get_messages_since(self, cursor, limit=None):
+        """
+        Get messages logged after a cursor position
+
+        Args:
+            cursor: Value returned by the previous call (0 to start)
+            limit: Only return the newest N of those messages
+
+        Returns:
+            Tuple of (new messages, cursor for the next call)
+        """
+        with self.lock:
+            end = len(self.message_log)
+            start = min(cursor, end)
+            if limit is not None:
+                start = max(start, end - limit)
+            return self.message_log[start:end], end
+
     def get_stats(self):
         """Get statistics about message tracking"""
         with self.lock:
@@ -107,6 +148,10 @@ class MeshtasticBridge:
         self.lock = Lock()
         self.radio_settings = {}
 
+        # Bumped on every change so pollers (the GUI) can skip unchanged state
+        self.stats_version = 0
+        self.messages_version = 0
+
         # Channel configurations
         self.channel_map = {
             'LongFast': 'LongModerate',
@@ -215,9 +260,11 @@ class MeshtasticBridge:
 
             # Add to tracker
             self.tracker.add_message(msg_id, from_node, to_node, text, channel)
+            self.messages_version += 1
 
             with self.lock:
                 self.stats[source_radio]['received'] += 1
+                self.stats_version += 1
 
             logger.info(f"[{source_radio}] Received from {from_node}: {text}")
 
@@ -225,10 +272,12 @@ class MeshtasticBridge:
             try:
                 target_interface.sendText(text, channelIndex=channel)
                 self.tracker.mark_forwarded(msg_id)
+                self.messages_version += 1
 
                 target_radio = 'radio2' if source_radio == 'radio1' else 'radio1'
                 with self.lock:
                     self.stats[target_radio]['sent'] += 1
+                    self.stats_version += 1
 
                 logger.info(f"[{source_radio} -> {target_radio}] Forwarded message")
             except Exception as e:
@@ -236,6 +285,7 @@ class MeshtasticBridge:
                 target_radio = 'radio2' if source_radio == 'radio1' else 'radio1'
                 with self.lock:
                     self.stats[target_radio]['errors'] += 1
+                    self.stats_version += 1
 
         except Exception as e:
             logger.error(f"Error in _handle_message: {e}")
@@ -252,6 +302,10 @@ class MeshtasticBridge:
         """Get recent messages"""
         return self.tracker.get_recent_messages()
 
+    def get_messages_since(self, cursor, limit=None):
+        """Get messages received after a cursor (see MessageTracker.get_messages_since)"""
+        return self.tracker.get_messages_since(cursor, limit)
+
     def send_message(self, text, radio='radio1', channel=0):
         """Send a message through specified radio"""
         interface = self.interface1 if radio == 'radio1' else self.interface2
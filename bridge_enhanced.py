@@ -5,9 +5,13 @@ Bridges messages between multiple Meshtastic radios with advanced features
 """
 
 import time
+import queue
 import logging
+import operator
 from datetime import datetime
-from threading import Thread, Lock
+from threading import Thread, Event, Lock
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
 from pathlib import Path
 import sys
 
@@ -21,7 +25,7 @@ from message_filter import MessageFilter
 from database import DatabaseManager
 from metrics import MetricsCollector, MetricsServer
 from mqtt_bridge import MQTTBridge
-from web_interface import WebInterface, create_web_files
+from web_interface import WebInterface, create_web_files, web_files_current
 from bridge import MessageTracker
 
 # Configure logging
@@ -31,6 +35,42 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Max seconds to wait for a newly opened radio to report connected
+RADIO_CONNECT_TIMEOUT = 5.0
+
+# Receive dispatch
+RX_QUEUE_SIZE = 10000        # Max packets waiting for each worker
+RX_WORKER_COUNT = 2          # Threads running _handle_message
+
+# Packet fields present on every decoded text packet. 'channel' is left out:
+# protobuf-to-dict omits default values, so it is missing for channel 0.
+_packet_fields = operator.itemgetter('id', 'fromId', 'toId')
+
+# Database write batching
+DB_FLUSH_BATCH_SIZE = 500    # Max queued writes per transaction
+DB_FLUSH_INTERVAL = 0.2      # Max seconds to wait while filling a batch
+
+
+def _noop(*args, **kwargs):
+    """Do nothing"""
+    return None
+
+
+class _NullComponent:
+    """Stand-in for a disabled component; every method call is a no-op
+
+    Instances are falsy, so existing ``if self.mqtt:`` style checks keep
+    working, while hot paths can call methods unconditionally.
+    """
+
+    def __bool__(self):
+        return False
+
+    def __getattr__(self, name):
+        # Cache on the instance so later lookups skip __getattr__
+        self.__dict__[name] = _noop
+        return _noop
+
 
 class EnhancedMeshtasticBridge:
     """Enhanced bridge with configuration, filtering, database, metrics, MQTT, and web UI"""
@@ -50,7 +90,7 @@ class EnhancedMeshtasticBridge:
         if warnings:
             logger.warning("Configuration warnings:")
             for warning in warnings:
-                logger.warning(f"  - {warning}")
+                logger.warning("  - %s", warning)
 
         # Bridge settings
         bridge_config = self.config.get('bridge', {})
@@ -60,6 +100,17 @@ class EnhancedMeshtasticBridge:
         # Radio interfaces
         self.interfaces = []
         self.radio_names = []
+        self.radio_settings = {}
+
+        # Index lookups, keyed by id(interface) and radio name
+        self._iface_to_idx = {}
+        self._name_to_idx = {}
+
+        # One stats lock per radio, created alongside the counters
+        self._radio_locks = []
+
+        # Per source index: (idx, interface, radio_name) of every other radio
+        self._forward_targets = []
 
         # Message tracker
         tracker_config = bridge_config.get('message_tracking', {})
@@ -74,7 +125,7 @@ class EnhancedMeshtasticBridge:
 
         # Database
         db_config = self.config.get('database', {})
-        self.database = None
+        self.database = _NullComponent()
         if db_config.get('enabled'):
             self.database = DatabaseManager(
                 db_path=db_config.get('path', './meshtastic_bridge.db'),
@@ -84,7 +135,7 @@ class EnhancedMeshtasticBridge:
 
         # Metrics
         metrics_config = self.config.get('metrics', {})
-        self.metrics = None
+        self.metrics = _NullComponent()
         self.metrics_server = None
         if metrics_config.get('enabled'):
             self.metrics = MetricsCollector()
@@ -96,16 +147,22 @@ class EnhancedMeshtasticBridge:
 
         # MQTT
         mqtt_config = self.config.get('mqtt', {})
-        self.mqtt = None
+        self.mqtt = _NullComponent()
         if mqtt_config.get('enabled'):
             self.mqtt = MQTTBridge(mqtt_config, self._mqtt_message_callback)
 
+        self.running = False
+
         # Web interface
         web_config = self.config.get('web', {})
-        self.web = None
+        self.web = _NullComponent()
         if web_config.get('enabled'):
-            # Create web files if they don't exist
-            if not Path('web/templates/index.html').exists():
+            # Create web files if they don't exist, or regenerate them when
+            # they were written by an older version (e.g. an app.js that
+            # still polls and listens for 'new_message')
+            if not web_files_current():
+                if Path('web/templates/index.html').exists():
+                    logger.info("Web interface files are out of date, regenerating")
                 create_web_files()
 
             # For web interface compatibility
@@ -113,8 +170,6 @@ class EnhancedMeshtasticBridge:
             self.port2 = None
             self.interface1 = None
             self.interface2 = None
-            self.radio_settings = {}
-            self.running = False
             self.stats = {}
 
             self.web = WebInterface(self, web_config)
@@ -122,8 +177,19 @@ class EnhancedMeshtasticBridge:
         # Background tasks
         self.cleanup_thread = None
         self.stats_thread = None
+        self.db_flush_thread = None
+        self.rx_threads = []
 
-        self.lock = Lock()
+        # Set on close() to wake the periodic tasks immediately
+        self._shutdown = Event()
+
+        # Received packets, handed off from the radio reader threads. One
+        # queue per worker, sharded by source radio, so each radio's packets
+        # are handled in order by a single worker
+        self._rx_queues = [queue.Queue(maxsize=RX_QUEUE_SIZE) for _ in range(RX_WORKER_COUNT)]
+
+        # Pending database writes, drained by the flusher thread
+        self._write_queue = queue.Queue()
 
     def connect(self):
         """Connect to all configured radios"""
@@ -144,30 +210,49 @@ class EnhancedMeshtasticBridge:
                 raise RuntimeError("auto_detect is False but no ports specified in configuration")
             ports_to_use = self.ports
 
-        # Connect to each radio
-        for idx, port in enumerate(ports_to_use):
-            radio_name = f"radio{idx + 1}"
-            logger.info(f"Connecting to {radio_name} on {port}...")
+        # Open all radios in parallel
+        with ThreadPoolExecutor(max_workers=len(ports_to_use)) as executor:
+            futures = [executor.submit(self._open_radio, port) for port in ports_to_use]
 
+        opened = []
+        error = None
+        for idx, future in enumerate(futures):
             try:
-                interface = meshtastic.serial_interface.SerialInterface(port)
-                time.sleep(2)  # Wait for connection to stabilize
+                opened.append(future.result())
+            except Exception as e:
+                logger.error("Failed to connect to radio%d: %s", idx + 1, e)
+                error = error or e
+
+        if error:
+            for interface in opened:
+                try:
+                    interface.close()
+                except Exception as e:
+                    logger.error("Error closing interface: %s", e)
+            raise error
+
+        # Register each radio
+        for idx, (port, interface) in enumerate(zip(ports_to_use, opened)):
+            radio_name = f"radio{idx + 1}"
 
+            try:
                 self.interfaces.append(interface)
                 self.radio_names.append(radio_name)
+                self._iface_to_idx[id(interface)] = idx
+                self._name_to_idx[radio_name] = idx
 
                 # Check settings
                 settings = DeviceManager.check_radio_settings(interface, port)
                 self.radio_settings[radio_name] = settings
 
-                logger.info(f"{radio_name} connected successfully")
+                logger.info("%s connected successfully", radio_name)
 
                 if settings.get('recommendations'):
                     for rec in settings['recommendations']:
-                        logger.warning(f"{radio_name}: {rec}")
+                        logger.warning("%s: %s", radio_name, rec)
 
             except Exception as e:
-                logger.error(f"Failed to connect to {radio_name}: {e}")
+                logger.error("Failed to connect to %s: %s", radio_name, e)
                 self._cleanup_connections()
                 raise
 
@@ -178,11 +263,20 @@ class EnhancedMeshtasticBridge:
             self.port1 = ports_to_use[0]
             self.port2 = ports_to_use[1]
 
-        # Initialize stats
-        self.stats = {name: {'received': 0, 'sent': 0, 'errors': 0} for name in self.radio_names}
+        # Precompute forward targets for each source radio
+        count = len(self.interfaces)
+        self._forward_targets = [
+            [(idx, self.interfaces[idx], self.radio_names[idx]) for idx in range(count) if idx != source_idx]
+            for source_idx in range(count)
+        ]
+
+        # Initialize stats (per-radio counters, each guarded by its own lock)
+        self.stats = {name: SimpleNamespace(received=0, sent=0, errors=0) for name in self.radio_names}
+        self._radio_locks = [Lock() for _ in self.radio_names]
 
-        # Subscribe to message events
-        pub.subscribe(self._on_receive, "meshtastic.receive")
+        # Subscribe to text message events only; meshtastic publishes each
+        # port on its own subtopic, so other packet types never reach us
+        pub.subscribe(self._on_receive, "meshtastic.receive.text")
 
         # Start metrics server
         if self.metrics_server:
@@ -197,174 +291,185 @@ class EnhancedMeshtasticBridge:
         if self.web:
             self.web.start()
 
+        self.running = True
+
         # Start background tasks
         self._start_background_tasks()
 
-        self.running = True
-        logger.info(f"Enhanced bridge is now running with {len(self.interfaces)} radios")
+        logger.info("Enhanced bridge is now running with %d radios", len(self.interfaces))
+
+    def _open_radio(self, port: str):
+        """Open a radio and wait until it reports connected"""
+        logger.info("Connecting to radio on %s...", port)
+        interface = meshtastic.serial_interface.SerialInterface(port)
+
+        if not interface.isConnected.wait(timeout=RADIO_CONNECT_TIMEOUT):
+            logger.warning("Radio on %s did not report connected within %.0fs", port, RADIO_CONNECT_TIMEOUT)
+
+        return interface
 
     def _on_receive(self, packet, interface):
-        """Handle messages received on any radio"""
+        """Queue messages received on any radio for the worker threads"""
         try:
-            # Determine which radio received this
-            source_idx = None
-            for idx, iface in enumerate(self.interfaces):
-                if interface == iface:
-                    source_idx = idx
-                    break
+            # Nothing new is accepted once close() has started draining.
+            # Packets arriving during startup just wait for the workers
+            if self._shutdown.is_set():
+                return
 
+            # Determine which radio received this
+            source_idx = self._iface_to_idx.get(id(interface))
             if source_idx is None:
                 return
 
-            source_radio = self.radio_names[source_idx]
-            self._handle_message(packet, source_radio, source_idx)
+            self._rx_queues[source_idx % RX_WORKER_COUNT].put_nowait((packet, source_idx))
 
+        except queue.Full:
+            logger.warning("Receive queue full, dropping packet")
+            self.metrics.increment_dropped()
         except Exception as e:
-            logger.error(f"Error handling message: {e}")
+            logger.error("Error handling message: %s", e)
+
+    def _rx_worker(self, rx_queue: queue.Queue):
+        """Process packets from a receive queue until close() sends a None sentinel"""
+        while True:
+            item = rx_queue.get()
+            if item is None:
+                return
+
+            packet, source_idx = item
+            self._handle_message(packet, self.radio_names[source_idx], source_idx)
 
     def _handle_message(self, packet, source_radio: str, source_idx: int):
         """Process and forward a message"""
-        start_time = time.time()
-
         try:
-            # Extract message details
-            if 'decoded' not in packet:
+            # Only handle text messages
+            decoded = packet.get('decoded')
+            if not decoded or decoded.get('portnum') != 'TEXT_MESSAGE_APP':
                 return
 
-            decoded = packet['decoded']
+            start_ns = time.monotonic_ns()
 
-            # Only handle text messages
-            if decoded.get('portnum') != 'TEXT_MESSAGE_APP':
-                return
+            try:
+                msg_id, from_node, to_node = _packet_fields(packet)
+            except KeyError:
+                msg_id = packet.get('id', 0)
+                from_node = packet.get('fromId', 'unknown')
+                to_node = packet.get('toId', 'unknown')
 
-            msg_id = packet.get('id', 0)
-            from_node = packet.get('fromId', 'unknown')
-            to_node = packet.get('toId', 'unknown')
+            # Check if we've already seen this message
+            if self.tracker.has_seen(msg_id):
+                logger.debug("Already seen message %s, skipping", msg_id)
+                return
 
             # Get the text payload
             payload = decoded.get('payload', b'')
-            if isinstance(payload, bytes):
-                text = payload.decode('utf-8', errors='ignore')
-            else:
-                text = str(payload)
+            text = payload.decode('utf-8', 'replace') if type(payload) is bytes else str(payload)
 
             # Get channel info
             channel = packet.get('channel', 0)
 
-            # Check if we've already seen this message
-            if self.tracker.has_seen(msg_id):
-                logger.debug(f"Already seen message {msg_id}, skipping")
-                return
-
             # Apply message filter
-            message_dict = {
-                'id': msg_id,
-                'from': from_node,
-                'to': to_node,
-                'text': text,
-                'channel': channel
-            }
-
-            if self.message_filter and not self.message_filter.should_forward(message_dict):
-                logger.info(f"Message from {from_node} filtered out")
-                if self.metrics:
+            if self.message_filter:
+                message_dict = {
+                    'id': msg_id,
+                    'from': from_node,
+                    'to': to_node,
+                    'text': text,
+                    'channel': channel
+                }
+
+                if not self.message_filter.should_forward(message_dict):
+                    logger.info("Message from %s filtered out", from_node)
                     self.metrics.increment_filtered()
-                return
+                    return
 
-            # Add to tracker
+            # Add to tracker; another worker may have claimed the same
+            # message (heard on a different radio) since the check above
             timestamp = datetime.now()
-            entry = self.tracker.add_message(msg_id, from_node, to_node, text, channel)
+            entry = self.tracker.check_and_add(msg_id, from_node, to_node, text, channel, timestamp)
+            if entry is None:
+                logger.debug("Already seen message %s, skipping", msg_id)
+                return
 
             # Update stats
-            with self.lock:
-                self.stats[source_radio]['received'] += 1
+            with self._radio_locks[source_idx]:
+                self.stats[source_radio].received += 1
 
-            if self.metrics:
-                self.metrics.increment_received(source_radio)
-                self.metrics.increment_node_messages(from_node)
+            metrics = self.metrics
+            metrics.increment_received(source_radio)
+            metrics.increment_node_messages(from_node)
 
-            logger.info(f"[{source_radio}] Received from {from_node}: {text}")
+            logger.info("[%s] Received from %s: %s", source_radio, from_node, text)
 
-            # Save to database
+            # Queue for database
             if self.database:
-                self.database.add_message(msg_id, from_node, to_node, text, channel, timestamp, False, source_radio, None)
+                self._write_queue.put(('msg', (msg_id, from_node, to_node, text, channel, timestamp, False, source_radio, None)))
 
             # Publish to MQTT
-            if self.mqtt:
-                entry['timestamp'] = timestamp
-                self.mqtt.publish_message(entry, 'incoming')
-
-            # Broadcast to web clients
-            if self.web:
-                entry['timestamp'] = timestamp
-                self.web.broadcast_message(entry)
+            self.mqtt.publish_message(entry, 'incoming')
 
             # Forward to other radios
             forwarded = False
-            for idx, interface in enumerate(self.interfaces):
-                if idx == source_idx:
-                    continue  # Don't send back to source
-
-                target_radio = self.radio_names[idx]
-
+            for idx, interface, target_radio in self._forward_targets[source_idx]:
                 try:
                     interface.sendText(text, channelIndex=channel)
                     self.tracker.mark_forwarded(msg_id)
                     forwarded = True
 
-                    with self.lock:
-                        self.stats[target_radio]['sent'] += 1
+                    with self._radio_locks[idx]:
+                        self.stats[target_radio].sent += 1
 
-                    if self.metrics:
-                        self.metrics.increment_sent(target_radio)
-                        self.metrics.increment_forwarded()
+                    metrics.increment_sent(target_radio)
+                    metrics.increment_forwarded()
 
                     if self.database:
-                        self.database.mark_forwarded(msg_id)
+                        self._write_queue.put(('fwd', msg_id))
 
-                    logger.info(f"[{source_radio} -> {target_radio}] Forwarded message")
+                    logger.info("[%s -> %s] Forwarded message", source_radio, target_radio)
 
                 except Exception as e:
-                    logger.error(f"Failed to forward to {target_radio}: {e}")
-                    with self.lock:
-                        self.stats[target_radio]['errors'] += 1
+                    logger.error("Failed to forward to %s: %s", target_radio, e)
+                    with self._radio_locks[idx]:
+                        self.stats[target_radio].errors += 1
+
+                    metrics.increment_errors(target_radio)
+                    metrics.increment_dropped()
 
-                    if self.metrics:
-                        self.metrics.increment_errors(target_radio)
-                        self.metrics.increment_dropped()
+            # Broadcast to web clients once the forwarding outcome is known
+            self.web.broadcast_message(entry)
 
             # Record processing time
-            if self.metrics:
-                processing_time = (time.time() - start_time) * 1000
-                self.metrics.record_processing_time(processing_time)
+            if metrics:
+                processing_time = (time.monotonic_ns() - start_ns) / 1_000_000
+                metrics.record_processing_time(processing_time)
 
         except Exception as e:
-            logger.error(f"Error in _handle_message: {e}")
+            logger.error("Error in _handle_message: %s", e)
 
     def _mqtt_message_callback(self, text: str, radio: str, channel: int):
         """Handle messages from MQTT for sending"""
         try:
             # Find the radio interface
-            if radio in self.radio_names:
-                idx = self.radio_names.index(radio)
+            idx = self._name_to_idx.get(radio)
+            if idx is not None:
                 self.interfaces[idx].sendText(text, channelIndex=channel)
-                logger.info(f"Sent message from MQTT via {radio}: {text}")
+                logger.info("Sent message from MQTT via %s: %s", radio, text)
             else:
-                logger.warning(f"Unknown radio '{radio}' specified in MQTT message")
+                logger.warning("Unknown radio '%s' specified in MQTT message", radio)
 
         except Exception as e:
-            logger.error(f"Error sending MQTT message: {e}")
+            logger.error("Error sending MQTT message: %s", e)
 
     def send_message(self, text: str, radio: str = 'radio1', channel: int = 0) -> bool:
         """Send a message through specified radio"""
         try:
-            if radio not in self.radio_names:
-                logger.error(f"Unknown radio: {radio}")
+            idx = self._name_to_idx.get(radio)
+            if idx is None:
+                logger.error("Unknown radio: %s", radio)
                 return False
 
-            idx = self.radio_names.index(radio)
             self.interfaces[idx].sendText(text, channelIndex=channel)
-            logger.info(f"Sent message via {radio}: {text}")
+            logger.info("Sent message via %s: %s", radio, text)
 
             # Publish to MQTT
             if self.mqtt:
@@ -382,22 +487,25 @@ class EnhancedMeshtasticBridge:
             return True
 
         except Exception as e:
-            logger.error(f"Failed to send message: {e}")
+            logger.error("Failed to send message: %s", e)
             return False
 
     def get_stats(self) -> dict:
         """Get bridge statistics"""
-        with self.lock:
-            stats = self.stats.copy()
-            stats['tracker'] = self.tracker.get_stats()
+        # Snapshot one radio at a time so radios never block each other
+        stats = {}
+        for lock, (name, counters) in zip(self._radio_locks, self.stats.items()):
+            with lock:
+                stats[name] = vars(counters).copy()
+        stats['tracker'] = self.tracker.get_stats()
 
-            if self.message_filter:
-                stats['filter'] = self.message_filter.get_stats()
+        if self.message_filter:
+            stats['filter'] = self.message_filter.get_stats()
 
-            if self.mqtt:
-                stats['mqtt'] = self.mqtt.get_stats()
+        if self.mqtt:
+            stats['mqtt'] = self.mqtt.get_stats()
 
-            return stats
+        return stats
 
     def get_recent_messages(self, count: int = 50):
         """Get recent messages"""
@@ -410,10 +518,10 @@ class EnhancedMeshtasticBridge:
     def get_node_info(self, radio: str = 'radio1'):
         """Get node information from a radio"""
         try:
-            if radio not in self.radio_names:
+            idx = self._name_to_idx.get(radio)
+            if idx is None:
                 return None
 
-            idx = self.radio_names.index(radio)
             interface = self.interfaces[idx]
 
             if hasattr(interface, 'myInfo'):
@@ -421,11 +529,22 @@ class EnhancedMeshtasticBridge:
             return None
 
         except Exception as e:
-            logger.error(f"Failed to get node info: {e}")
+            logger.error("Failed to get node info: %s", e)
             return None
 
     def _start_background_tasks(self):
         """Start background maintenance tasks"""
+        # Receive workers
+        for rx_queue in self._rx_queues:
+            thread = Thread(target=self._rx_worker, args=(rx_queue,), daemon=True)
+            thread.start()
+            self.rx_threads.append(thread)
+
+        # Database write flusher
+        if self.database:
+            self.db_flush_thread = Thread(target=self._db_flusher, daemon=True)
+            self.db_flush_thread.start()
+
         # Database cleanup task
         if self.database:
             self.cleanup_thread = Thread(target=self._cleanup_task, daemon=True)
@@ -436,34 +555,55 @@ class EnhancedMeshtasticBridge:
             self.stats_thread = Thread(target=self._stats_task, daemon=True)
             self.stats_thread.start()
 
+    def _db_flusher(self):
+        """Drain queued database writes in batched transactions until a 'stop' item"""
+        stopping = False
+        while not stopping:
+            items = [self._write_queue.get()]
+
+            # Fill the batch until it is full or the interval elapses
+            deadline = time.monotonic() + DB_FLUSH_INTERVAL
+            while len(items) < DB_FLUSH_BATCH_SIZE and items[-1][0] != 'stop':
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    items.append(self._write_queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            stopping = items[-1][0] == 'stop'
+            messages = [data for kind, data in items if kind == 'msg']
+            forwarded = [data for kind, data in items if kind == 'fwd']
+
+            try:
+                self.database.write_batch(messages, forwarded)
+            except Exception as e:
+                logger.error("Error in database flusher: %s", e)
+
     def _cleanup_task(self):
         """Periodic database cleanup"""
-        while self.running:
+        while not self._shutdown.wait(3600):  # Run every hour
             try:
-                time.sleep(3600)  # Run every hour
                 if self.database:
                     self.database.cleanup_old_messages()
             except Exception as e:
-                logger.error(f"Error in cleanup task: {e}")
+                logger.error("Error in cleanup task: %s", e)
 
     def _stats_task(self):
         """Periodic statistics recording"""
-        while self.running:
+        while not self._shutdown.wait(300):  # Run every 5 minutes
             try:
-                time.sleep(300)  # Run every 5 minutes
-
                 stats = self.get_stats()
 
                 # Record to database
                 if self.database:
-                    for radio_name, radio_stats in stats.items():
-                        if isinstance(radio_stats, dict) and 'received' in radio_stats:
-                            self.database.record_statistics(
-                                radio_name,
-                                radio_stats['received'],
-                                radio_stats['sent'],
-                                radio_stats['errors']
-                            )
+                    rows = [
+                        (radio_name, radio_stats['received'], radio_stats['sent'], radio_stats['errors'])
+                        for radio_name, radio_stats in stats.items()
+                        if isinstance(radio_stats, dict) and 'received' in radio_stats
+                    ]
+                    self.database.record_statistics_many(rows)
 
                 # Publish to MQTT
                 if self.mqtt:
@@ -478,7 +618,11 @@ class EnhancedMeshtasticBridge:
                     self.web.broadcast_statistics(stats)
 
             except Exception as e:
-                logger.error(f"Error in stats task: {e}")
+                logger.error("Error in stats task: %s", e)
+
+    def run_forever(self):
+        """Block until the bridge is closed"""
+        self._shutdown.wait()
 
     def _cleanup_connections(self):
         """Clean up all radio connections"""
@@ -486,13 +630,26 @@ class EnhancedMeshtasticBridge:
             try:
                 interface.close()
             except Exception as e:
-                logger.error(f"Error closing interface: {e}")
+                logger.error("Error closing interface: %s", e)
 
     def close(self):
         """Close all connections and cleanup"""
         self.running = False
+        self._shutdown.set()
         logger.info("Closing enhanced bridge...")
 
+        # Let the receive workers finish every packet already queued; the
+        # sentinels queue up behind them, one per worker
+        for rx_queue in self._rx_queues[:len(self.rx_threads)]:
+            rx_queue.put(None)
+        for thread in self.rx_threads:
+            thread.join(timeout=5)
+
+        # Only then stop the flusher, so the workers' last writes are included
+        if self.db_flush_thread:
+            self._write_queue.put(('stop', None))
+            self.db_flush_thread.join(timeout=5)
+
         # Log shutdown event
         if self.database:
             self.database.log_event('shutdown', 'Enhanced bridge shutting down')
@@ -549,13 +706,12 @@ def main():
         if bridge.web:
             print(f"  Web UI: http://localhost:{bridge.config.get('web.port', 8080)}")
 
-        while bridge.running:
-            time.sleep(1)
+        bridge.run_forever()
 
     except KeyboardInterrupt:
         print("\nStopping bridge...")
     except Exception as e:
-        logger.error(f"Fatal error: {e}")
+        logger.error("Fatal error: %s", e)
         import traceback
         traceback.print_exc()
     finally:
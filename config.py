@@ -6,18 +6,89 @@ Supports YAML and JSON configuration files
 
 import os
 import json
+import stat
+import hashlib
 import logging
+from collections import defaultdict
 from pathlib import Path
+from types import MappingProxyType
 from typing import Dict, Any, Optional, List
 
 try:
     import yaml
     YAML_AVAILABLE = True
+
+    # Prefer the libyaml-backed C implementations when PyYAML was built with them
+    try:
+        from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+    except ImportError:
+        from yaml import SafeLoader, SafeDumper
 except ImportError:
     YAML_AVAILABLE = False
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Parsed config files are cached here, keyed by path, mtime and size
+CONFIG_CACHE_DIR = os.path.join(
+    os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'),
+    'meshtastic-bridge'
+)
+
+
+def _is_private_file(st: os.stat_result) -> bool:
+    """True if a file is owned by the current user and writable by no one else"""
+    if hasattr(os, 'getuid') and st.st_uid != os.getuid():
+        return False
+    return not st.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+
+
+def _json_load(f) -> Any:
+    """Read JSON from an open text file, using orjson when available"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(f.read())
+    return json.load(f)
+
+
+def _json_dump(data: Any, f) -> None:
+    """Write indented JSON to an open text file, using orjson when available"""
+    if ORJSON_AVAILABLE:
+        f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode('utf-8'))
+    else:
+        json.dump(data, f, indent=2)
+
+
+# YAML files below this size are read into memory and parsed in one pass;
+# larger files are streamed from the file handle
+YAML_STREAM_THRESHOLD = 128 * 1024
+
+
+def _freeze(value: Any) -> Any:
+    """Recursively turn dicts into read-only mappings and lists into tuples"""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    """Build an independent, modifiable copy of a _freeze()d structure"""
+    if isinstance(value, (dict, MappingProxyType)):
+        return {k: _thaw(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(v) for v in value]
+    return value
+
+
+# Marks a dotted key that doesn't resolve (None is a valid config value)
+_MISSING = object()
+
 
 class ConfigurationError(Exception):
     """Raised when there's a configuration error"""
@@ -27,7 +98,8 @@ class ConfigurationError(Exception):
 class BridgeConfig:
     """Configuration manager for the Meshtastic Bridge"""
 
-    DEFAULT_CONFIG = {
+    # Read-only at every level; _default_config() hands out independent copies
+    DEFAULT_CONFIG = _freeze({
         'bridge': {
             'auto_detect': True,
             'ports': [],
@@ -69,7 +141,10 @@ class BridgeConfig:
             'password': None,
             'topic_prefix': 'meshtastic/bridge',
             'publish_incoming': True,
-            'publish_outgoing': True
+            'publish_outgoing': True,
+            'publish_text': True,
+            'publish_channel_topic': True,
+            'timestamp_format': 'iso'
         },
         'web': {
             'enabled': False,
@@ -83,7 +158,23 @@ class BridgeConfig:
             'max_bytes': 10485760,  # 10MB
             'backup_count': 5
         }
-    }
+    })
+
+    # Settings that create_example_config() changes from the defaults
+    EXAMPLE_OVERRIDES = _freeze({
+        'bridge': {
+            'ports': ['# /dev/ttyUSB0', '# /dev/ttyUSB1']
+        },
+        'filtering': {
+            'content_filters': {
+                'keywords': ['urgent', 'emergency']
+            }
+        },
+        'database': {'enabled': True},
+        'metrics': {'enabled': True},
+        'web': {'enabled': True},
+        'logging': {'file': './meshtastic-bridge.log'}
+    })
 
     def __init__(self, config_path: Optional[str] = None):
         """
@@ -95,10 +186,14 @@ class BridgeConfig:
         self.config_path = config_path
         self.config = self._load_config()
 
+        # Every dotted path (leaves and subtrees) mapped to a read-only view
+        # of its value
+        self._flat = self._flatten(_freeze(self.config))
+
     def _load_config(self) -> Dict[str, Any]:
         """Load configuration from file or use defaults"""
         # Start with default config
-        config = self.DEFAULT_CONFIG.copy()
+        config = self._default_config()
 
         # If no config path specified, look for default locations
         if not self.config_path:
@@ -111,11 +206,10 @@ class BridgeConfig:
                 '/etc/meshtastic-bridge/config.yaml'
             ]
 
-            for path in default_paths:
-                if os.path.exists(path):
-                    self.config_path = path
-                    logger.info(f"Found configuration file: {path}")
-                    break
+            path = self._find_config_file(default_paths)
+            if path:
+                self.config_path = path
+                logger.info(f"Found configuration file: {path}")
 
         # Load from file if it exists
         if self.config_path and os.path.exists(self.config_path):
@@ -130,25 +224,102 @@ class BridgeConfig:
 
         return config
 
+    @staticmethod
+    def _find_config_file(paths: List[str]) -> Optional[str]:
+        """Return the first of paths that exists, listing each directory only once"""
+        by_dir = defaultdict(set)
+        for path in paths:
+            directory, name = os.path.split(path)
+            by_dir[directory or '.'].add(name)
+
+        found = set()
+        for directory, names in by_dir.items():
+            try:
+                with os.scandir(directory) as entries:
+                    found.update(
+                        os.path.join(directory, entry.name)
+                        for entry in entries if entry.name in names
+                    )
+            except OSError:
+                continue
+
+        # Preserve priority order
+        for path in paths:
+            directory, name = os.path.split(path)
+            if os.path.join(directory or '.', name) in found:
+                return path
+
+        return None
+
+    @classmethod
+    def _default_config(cls) -> Dict[str, Any]:
+        """Return a copy of the defaults that is safe to modify"""
+        return _thaw(cls.DEFAULT_CONFIG)
+
     def _read_config_file(self, path: str) -> Dict[str, Any]:
-        """Read configuration file (YAML or JSON)"""
+        """Read configuration file, reusing the cached parse if the file is unchanged"""
+        abs_path = os.path.abspath(path)
+        st = os.stat(abs_path)
+        key = f"{abs_path}:{st.st_mtime_ns}:{st.st_size}"
+        cache_file = os.path.join(
+            CONFIG_CACHE_DIR, hashlib.sha256(abs_path.encode('utf-8')).hexdigest() + '.json'
+        )
+
+        # Cache hit: skip the parser entirely. The cache is plain JSON, and is
+        # only trusted if no other user could have written it
+        try:
+            if _is_private_file(os.stat(cache_file)):
+                with open(cache_file, 'r') as f:
+                    cached = _json_load(f)
+                if cached.get('key') == key:
+                    logger.debug(f"Using cached configuration for {path}")
+                    return cached['data']
+        except Exception:
+            pass
+
+        data = self._parse_config_file(path)
+
+        # Write atomically so a concurrent reader never sees a partial file
+        try:
+            # Only cache configs that survive a JSON round trip unchanged
+            # (YAML can yield dates or non-string keys)
+            if json.loads(json.dumps(data)) == data:
+                os.makedirs(CONFIG_CACHE_DIR, mode=0o700, exist_ok=True)
+                tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+                fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+                with os.fdopen(fd, 'w') as f:
+                    _json_dump({'key': key, 'data': data}, f)
+                os.replace(tmp_file, cache_file)
+        except Exception as e:
+            logger.debug(f"Could not write configuration cache: {e}")
+
+        return data
+
+    def _parse_config_file(self, path: str) -> Dict[str, Any]:
+        """Parse configuration file (YAML or JSON)"""
         with open(path, 'r') as f:
             if path.endswith(('.yaml', '.yml')):
                 if not YAML_AVAILABLE:
                     raise ConfigurationError("PyYAML not installed. Install with: pip install pyyaml")
-                return yaml.safe_load(f) or {}
+                if os.fstat(f.fileno()).st_size < YAML_STREAM_THRESHOLD:
+                    return yaml.load(f.read(), Loader=SafeLoader) or {}
+                return yaml.load(f, Loader=SafeLoader) or {}
             elif path.endswith('.json'):
-                return json.load(f)
+                return _json_load(f)
             else:
                 raise ConfigurationError(f"Unsupported config file format: {path}")
 
     def _merge_configs(self, base: Dict[str, Any], override: Dict[str, Any]) -> Dict[str, Any]:
         """Recursively merge two configuration dictionaries"""
-        result = base.copy()
+        if not override:
+            return base
+
+        result = {**base}
 
         for key, value in override.items():
-            if key in result and isinstance(result[key], dict) and isinstance(value, dict):
-                result[key] = self._merge_configs(result[key], value)
+            base_value = result.get(key)
+            if isinstance(base_value, dict) and isinstance(value, dict):
+                result[key] = self._merge_configs(base_value, value)
             else:
                 result[key] = value
 
@@ -158,20 +329,29 @@ class BridgeConfig:
         """
         Get configuration value using dot notation
 
+        Sections come back as read-only mappings and lists as tuples, so the
+        dotted-key index can't go stale; use set() to change the configuration.
+
         Examples:
             config.get('bridge.auto_detect')
             config.get('mqtt.enabled')
         """
-        keys = key.split('.')
-        value = self.config
+        value = self._flat.get(key, _MISSING)
+        if value is _MISSING:
+            return default
+        return value
 
-        for k in keys:
-            if isinstance(value, dict) and k in value:
-                value = value[k]
-            else:
-                return default
+    def _flatten(self, config: MappingProxyType, prefix: str = '') -> Dict[str, Any]:
+        """Map every dotted path in a _freeze()d config tree to its value"""
+        flat = {}
 
-        return value
+        for key, value in config.items():
+            path = f"{prefix}{key}"
+            flat[path] = value
+            if isinstance(value, MappingProxyType):
+                flat.update(self._flatten(value, f"{path}."))
+
+        return flat
 
     def set(self, key: str, value: Any) -> None:
         """
@@ -190,6 +370,7 @@ class BridgeConfig:
             config = config[k]
 
         config[keys[-1]] = value
+        self._flat = self._flatten(_freeze(self.config))
 
     def save(self, path: Optional[str] = None) -> None:
         """Save configuration to file"""
@@ -203,9 +384,9 @@ class BridgeConfig:
             if save_path.endswith(('.yaml', '.yml')):
                 if not YAML_AVAILABLE:
                     raise ConfigurationError("PyYAML not installed. Install with: pip install pyyaml")
-                yaml.dump(self.config, f, default_flow_style=False)
+                yaml.dump(self.config, f, Dumper=SafeDumper, default_flow_style=False)
             elif save_path.endswith('.json'):
-                json.dump(self.config, f, indent=2)
+                _json_dump(self.config, f)
             else:
                 raise ConfigurationError(f"Unsupported config file format: {save_path}")
 
@@ -255,61 +436,8 @@ class BridgeConfig:
         """Create an example configuration file"""
         example_config = {
             '# Meshtastic Bridge Configuration': None,
-            'bridge': {
-                'auto_detect': True,
-                'ports': ['# /dev/ttyUSB0', '# /dev/ttyUSB1'],
-                'message_tracking': {
-                    'max_age_minutes': 10,
-                    'max_messages': 1000
-                }
-            },
-            'channels': {
-                'mapping': {
-                    'LongFast': 'LongModerate',
-                    'LongModerate': 'LongFast'
-                }
-            },
-            'filtering': {
-                'enabled': False,
-                'whitelist_nodes': [],
-                'blacklist_nodes': [],
-                'content_filters': {
-                    'keywords': ['urgent', 'emergency'],
-                    'regex_patterns': []
-                }
-            },
-            'database': {
-                'enabled': True,
-                'path': './meshtastic_bridge.db',
-                'retention_days': 30
-            },
-            'metrics': {
-                'enabled': True,
-                'port': 9090,
-                'path': '/metrics'
-            },
-            'mqtt': {
-                'enabled': False,
-                'broker': 'localhost',
-                'port': 1883,
-                'username': None,
-                'password': None,
-                'topic_prefix': 'meshtastic/bridge',
-                'publish_incoming': True,
-                'publish_outgoing': True
-            },
-            'web': {
-                'enabled': True,
-                'host': '0.0.0.0',
-                'port': 8080,
-                'api_enabled': True
-            },
-            'logging': {
-                'level': 'INFO',
-                'file': './meshtastic-bridge.log',
-                'max_bytes': 10485760,
-                'backup_count': 5
-            }
+            **self._merge_configs(self._default_config(),
+                                  _thaw(self.EXAMPLE_OVERRIDES))
         }
 
         # Remove comment entries for JSON
@@ -320,9 +448,9 @@ class BridgeConfig:
             if path.endswith(('.yaml', '.yml')):
                 if not YAML_AVAILABLE:
                     raise ConfigurationError("PyYAML not installed. Install with: pip install pyyaml")
-                yaml.dump(example_config, f, default_flow_style=False, sort_keys=False)
+                yaml.dump(example_config, f, Dumper=SafeDumper, default_flow_style=False, sort_keys=False)
             elif path.endswith('.json'):
-                json.dump(example_config, f, indent=2)
+                _json_dump(example_config, f)
             else:
                 raise ConfigurationError(f"Unsupported config file format: {path}")
 
@@ -7,13 +7,50 @@ Provides SQLite persistence for messages, nodes, and statistics
 import sqlite3
 import logging
 import json
+import queue
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Tuple, Iterator
 from pathlib import Path
+from contextlib import contextmanager
 from threading import Lock
+from collections import Counter
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# Rows fetched per round trip by the iter_* generators
+READ_BATCH_SIZE = 128
+
+# Rows deleted per transaction by cleanup_old_messages()
+CLEANUP_CHUNK_SIZE = 5000
+
+
+def _json_dumps(data: Any) -> str:
+    """Encode data as a JSON string, using orjson when available"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+    return json.dumps(data)
+
+
+def _db_time(value: Any) -> Any:
+    """
+    Convert a datetime to the text stored in DATETIME columns
+
+    Done at each call site rather than with sqlite3.register_adapter, which
+    would change behaviour for every sqlite3 user in the process.
+
+    Returns:
+        'YYYY-MM-DD HH:MM:SS[.ffffff]' for datetimes, anything else unchanged
+    """
+    if isinstance(value, datetime):
+        return value.isoformat(sep=' ')
+    return value
+
 
 class DatabaseManager:
     """Manages SQLite database for message persistence"""
@@ -31,6 +68,16 @@ class DatabaseManager:
         self.conn: Optional[sqlite3.Connection] = None
         self.lock = Lock()
 
+        # Pool of read-only connections: concurrent readers each borrow one
+        # and never wait on each other or on the write lock (WAL)
+        self._read_uri: Optional[str] = None
+        self._read_pool: queue.SimpleQueue = queue.SimpleQueue()
+        self._read_conns: List[sqlite3.Connection] = []
+        self._read_conns_lock = Lock()
+
+        # Set once the FTS5 search index is available
+        self._fts_enabled = False
+
         # Create database directory if it doesn't exist
         db_dir = Path(db_path).parent
         if db_dir and not db_dir.exists():
@@ -44,6 +91,14 @@ class DatabaseManager:
             self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
             self.conn.row_factory = sqlite3.Row
 
+            # WAL lets readers proceed during writes; NORMAL syncs at checkpoints only
+            self.conn.execute('PRAGMA journal_mode=WAL')
+            self.conn.execute('PRAGMA synchronous=NORMAL')
+            self.conn.execute('PRAGMA temp_store=MEMORY')
+            self.conn.execute('PRAGMA cache_size=-65536')
+            self.conn.execute('PRAGMA mmap_size=268435456')
+            self.conn.execute('PRAGMA foreign_keys=OFF')
+
             cursor = self.conn.cursor()
 
             # Messages table
@@ -70,9 +125,24 @@ class DatabaseManager:
                 ON messages(timestamp DESC)
             ''')
 
+            # Composite indexes serve the get_messages() filters and their
+            # timestamp ordering; (from_node, timestamp) supersedes from_node alone
+            cursor.execute('DROP INDEX IF EXISTS idx_messages_from_node')
+
             cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_messages_from_node
-                ON messages(from_node)
+                CREATE INDEX IF NOT EXISTS idx_messages_from_ts
+                ON messages(from_node, timestamp DESC)
+            ''')
+
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_messages_channel_ts
+                ON messages(channel, timestamp DESC)
+            ''')
+
+            # Partial index: only forwarded rows, for the summary count
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_messages_forwarded
+                ON messages(forwarded) WHERE forwarded = 1
             ''')
 
             # Nodes table
@@ -122,42 +192,265 @@ class DatabaseManager:
                 )
             ''')
 
+            # Counters table (running totals kept in step with inserts)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS counters (
+                    name TEXT PRIMARY KEY,
+                    value INTEGER DEFAULT 0,
+                    day DATE
+                )
+            ''')
+
             self.conn.commit()
+
+            self._initialize_search_index()
+            self._reconcile_counters()
+
+            # Readers may connect once the schema exists
+            self._read_uri = f"{Path(self.db_path).resolve().as_uri()}?mode=ro"
+
             logger.info(f"Database initialized: {self.db_path}")
 
         except Exception as e:
             logger.error(f"Failed to initialize database: {e}")
             raise
 
+    @contextmanager
+    def _reader(self):
+        """Borrow a read-only connection from the pool, opening one if none is idle"""
+        try:
+            conn = self._read_pool.get_nowait()
+        except queue.Empty:
+            conn = sqlite3.connect(self._read_uri, uri=True, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+
+            with self._read_conns_lock:
+                self._read_conns.append(conn)
+
+        try:
+            yield conn
+        finally:
+            self._read_pool.put(conn)
+
+    def _initialize_search_index(self):
+        """Create the FTS5 index over message text and the triggers that sync it"""
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'messages_fts'"
+            )
+            exists = cursor.fetchone() is not None
+
+            cursor.execute('''
+                CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts
+                USING fts5(text, content='messages', content_rowid='id')
+            ''')
+
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS messages_fts_insert AFTER INSERT ON messages
+                BEGIN
+                    INSERT INTO messages_fts(rowid, text) VALUES (new.id, new.text);
+                END
+            ''')
+
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS messages_fts_delete AFTER DELETE ON messages
+                BEGIN
+                    INSERT INTO messages_fts(messages_fts, rowid, text)
+                    VALUES ('delete', old.id, old.text);
+                END
+            ''')
+
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS messages_fts_update AFTER UPDATE OF text ON messages
+                BEGIN
+                    INSERT INTO messages_fts(messages_fts, rowid, text)
+                    VALUES ('delete', old.id, old.text);
+                    INSERT INTO messages_fts(rowid, text) VALUES (new.id, new.text);
+                END
+            ''')
+
+            # Index messages stored before the search table existed
+            if not exists:
+                cursor.execute("INSERT INTO messages_fts(messages_fts) VALUES ('rebuild')")
+
+            self.conn.commit()
+            self._fts_enabled = True
+
+        except sqlite3.OperationalError as e:
+            self.conn.rollback()
+            logger.warning(f"Full-text search unavailable, falling back to LIKE: {e}")
+
     def add_message(self, msg_id: str, from_node: str, to_node: str, text: str,
                    channel: int, timestamp: datetime, forwarded: bool = False,
                    source_radio: str = None, target_radio: str = None) -> int:
         """
         Add a message to the database
 
+        For many messages at once use add_messages() or write_batch(), which
+        commit them in a single transaction.
+
         Returns:
-            Message ID in database
+            Message ID in database (of the existing row for a duplicate), -1 on error
         """
+        timestamp = _db_time(timestamp)
+        row = (msg_id, from_node, to_node, text, channel, timestamp,
+               forwarded, source_radio, target_radio)
+
         with self.lock:
             try:
-                cursor = self.conn.cursor()
-                cursor.execute('''
-                    INSERT OR IGNORE INTO messages
-                    (msg_id, from_node, to_node, text, channel, timestamp, forwarded, source_radio, target_radio)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (msg_id, from_node, to_node, text, channel, timestamp, forwarded, source_radio, target_radio))
-
-                self.conn.commit()
-
-                # Update node statistics
-                self.update_node(from_node)
+                with self.conn:
+                    self._insert_messages([row])
+                    found = self.conn.execute('''
+                        SELECT id FROM messages WHERE msg_id = ? AND timestamp = ?
+                    ''', (msg_id, timestamp)).fetchone()
 
-                return cursor.lastrowid
+                return found[0] if found else -1
 
             except Exception as e:
                 logger.error(f"Failed to add message: {e}")
                 return -1
 
+    def add_messages(self, messages: List[Tuple]) -> bool:
+        """
+        Insert several messages in a single transaction
+
+        Args:
+            messages: Tuples of (msg_id, from_node, to_node, text, channel,
+                      timestamp, forwarded, source_radio, target_radio)
+
+        Returns:
+            True if the batch was committed
+        """
+        return self.write_batch(messages, [])
+
+    def _insert_messages(self, messages: List[Tuple]) -> int:
+        """
+        Insert messages and update node and daily counters
+
+        Must be called with self.lock held, inside a transaction.
+
+        Returns:
+            Number of messages inserted (duplicates are ignored)
+        """
+        # AUTOINCREMENT ids only grow, so rows above this one are ours
+        last_id = self.conn.execute('SELECT COALESCE(MAX(id), 0) FROM messages').fetchone()[0]
+
+        # executemany's rowcount sums each row's own changes; total_changes
+        # would also count the rows the FTS trigger writes
+        inserted = self.conn.executemany('''
+            INSERT OR IGNORE INTO messages
+            (msg_id, from_node, to_node, text, channel, timestamp, forwarded, source_radio, target_radio)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (msg[:5] + (_db_time(msg[5]),) + msg[6:] for msg in messages)).rowcount
+
+        # Duplicates skipped by OR IGNORE must not count against their sender
+        if inserted == len(messages):
+            node_counts = Counter(msg[1] for msg in messages)
+        else:
+            node_counts = dict(self.conn.execute(
+                'SELECT from_node, COUNT(*) FROM messages WHERE id > ? GROUP BY from_node',
+                (last_id,)
+            ).fetchall())
+
+        # Count only rows that were not ignored as duplicates
+        if inserted > 0:
+            self.conn.execute('''
+                INSERT INTO counters (name, value, day)
+                VALUES ('messages_today', ?, ?)
+                ON CONFLICT(name) DO UPDATE SET
+                    value = CASE WHEN day = excluded.day
+                                 THEN value + excluded.value
+                                 ELSE excluded.value END,
+                    day = excluded.day
+            ''', (inserted, datetime.now().date().isoformat()))
+
+        # Update node statistics (one row per sender)
+        self.conn.executemany('''
+            INSERT INTO nodes (node_id, message_count)
+            VALUES (?, ?)
+            ON CONFLICT(node_id) DO UPDATE SET
+                last_seen = CURRENT_TIMESTAMP,
+                message_count = message_count + excluded.message_count
+        ''', node_counts.items())
+
+        return inserted
+
+    def write_batch(self, messages: List[Tuple], forwarded: List[str]) -> bool:
+        """
+        Write queued messages and forwarded flags in a single transaction
+
+        Args:
+            messages: Tuples of (msg_id, from_node, to_node, text, channel,
+                      timestamp, forwarded, source_radio, target_radio)
+            forwarded: Message IDs to mark as forwarded
+
+        Returns:
+            True if the batch was committed
+        """
+        if not messages and not forwarded:
+            return True
+
+        with self.lock:
+            try:
+                with self.conn:
+                    self._insert_messages(messages)
+
+                    self.conn.executemany('''
+                        UPDATE messages SET forwarded = 1 WHERE msg_id = ?
+                    ''', [(msg_id,) for msg_id in forwarded])
+
+                return True
+
+            except Exception as e:
+                logger.error(f"Failed to write batch: {e}")
+                return False
+
+    def bulk_import(self, messages: List[Tuple]) -> int:
+        """
+        Import a large set of messages, e.g. when replaying a packet log
+
+        All rows go in as one transaction with synchronous=OFF, so the import
+        costs a single sequential write instead of a sync per batch. WAL
+        auto-checkpoints are suspended meanwhile, so unsynced pages are only
+        ever appended to the WAL, never copied into the database file; the
+        next checkpoint runs after synchronous=NORMAL is restored. Power loss
+        mid-import can lose the import, but earlier data stays intact.
+
+        Args:
+            messages: Tuples of (msg_id, from_node, to_node, text, channel,
+                      timestamp, forwarded, source_radio, target_radio)
+
+        Returns:
+            Number of messages imported (duplicates are skipped), -1 on error
+        """
+        if not messages:
+            return 0
+
+        with self.lock:
+            autocheckpoint = self.conn.execute('PRAGMA wal_autocheckpoint').fetchone()[0]
+            try:
+                self.conn.execute('PRAGMA wal_autocheckpoint=0')
+                self.conn.execute('PRAGMA synchronous=OFF')
+                with self.conn:
+                    inserted = self._insert_messages(messages)
+
+            except Exception as e:
+                logger.error(f"Failed to import messages: {e}")
+                inserted = -1
+
+            finally:
+                # Restore syncing before anything may checkpoint again
+                self.conn.execute('PRAGMA synchronous=NORMAL')
+                self.conn.execute(f'PRAGMA wal_autocheckpoint={int(autocheckpoint)}')
+
+        # Imported history may not belong to today
+        self._reconcile_counters()
+
+        if inserted >= 0:
+            logger.info(f"Imported {inserted} messages")
+        return inserted
+
     def mark_forwarded(self, msg_id: str) -> bool:
         """Mark a message as forwarded"""
         with self.lock:
@@ -173,6 +466,56 @@ class DatabaseManager:
                 logger.error(f"Failed to mark message as forwarded: {e}")
                 return False
 
+    def _iter_rows(self, query: str, params: Tuple = ()) -> Iterator[Dict]:
+        """Run a read query and yield rows as dictionaries, READ_BATCH_SIZE at a time"""
+        with self._reader() as conn:
+            cursor = conn.execute(query, params)
+            try:
+                while True:
+                    rows = cursor.fetchmany(READ_BATCH_SIZE)
+                    if not rows:
+                        break
+                    for row in rows:
+                        yield dict(row)
+            finally:
+                cursor.close()
+
+    def iter_messages(self, limit: int = 100, offset: int = 0,
+                      from_node: str = None, channel: int = None,
+                      start_time: datetime = None, end_time: datetime = None) -> Iterator[Dict]:
+        """
+        Stream messages from database
+
+        Takes the same arguments as get_messages(), but yields each message
+        as it is read instead of building the whole list.
+
+        Yields:
+            Message dictionaries, newest first
+        """
+        query = 'SELECT * FROM messages WHERE 1=1'
+        params = []
+
+        if from_node:
+            query += ' AND from_node = ?'
+            params.append(from_node)
+
+        if channel is not None:
+            query += ' AND channel = ?'
+            params.append(channel)
+
+        if start_time:
+            query += ' AND timestamp >= ?'
+            params.append(_db_time(start_time))
+
+        if end_time:
+            query += ' AND timestamp <= ?'
+            params.append(_db_time(end_time))
+
+        query += ' ORDER BY timestamp DESC LIMIT ? OFFSET ?'
+        params.extend([limit, offset])
+
+        return self._iter_rows(query, tuple(params))
+
     def get_messages(self, limit: int = 100, offset: int = 0,
                     from_node: str = None, channel: int = None,
                     start_time: datetime = None, end_time: datetime = None) -> List[Dict]:
@@ -190,52 +533,54 @@ class DatabaseManager:
         Returns:
             List of message dictionaries
         """
-        with self.lock:
-            try:
-                cursor = self.conn.cursor()
-
-                query = 'SELECT * FROM messages WHERE 1=1'
-                params = []
-
-                if from_node:
-                    query += ' AND from_node = ?'
-                    params.append(from_node)
-
-                if channel is not None:
-                    query += ' AND channel = ?'
-                    params.append(channel)
-
-                if start_time:
-                    query += ' AND timestamp >= ?'
-                    params.append(start_time)
+        try:
+            return list(self.iter_messages(limit, offset, from_node, channel,
+                                           start_time, end_time))
 
-                if end_time:
-                    query += ' AND timestamp <= ?'
-                    params.append(end_time)
+        except Exception as e:
+            logger.error(f"Failed to retrieve messages: {e}")
+            return []
 
-                query += ' ORDER BY timestamp DESC LIMIT ? OFFSET ?'
-                params.extend([limit, offset])
+    def search_messages(self, search_text: str, limit: int = 100) -> List[Dict]:
+        """
+        Search messages by text content
 
-                cursor.execute(query, params)
-                rows = cursor.fetchall()
+        With the full-text index, every word of search_text must start a
+        word in the message ('hel wor' finds "Hello world"), so partial words
+        match from their beginning only: 'ell' does not find "hello". Without
+        the index any substring matches.
 
-                return [dict(row) for row in rows]
+        Args:
+            search_text: Words to look for
+            limit: Maximum number of messages to return
 
-            except Exception as e:
-                logger.error(f"Failed to retrieve messages: {e}")
-                return []
+        Returns:
+            Matching message dictionaries, newest first
+        """
+        terms = search_text.split()
 
-    def search_messages(self, search_text: str, limit: int = 100) -> List[Dict]:
-        """Search messages by text content"""
-        with self.lock:
+        with self._reader() as conn:
             try:
-                cursor = self.conn.cursor()
-                cursor.execute('''
-                    SELECT * FROM messages
-                    WHERE text LIKE ?
-                    ORDER BY timestamp DESC
-                    LIMIT ?
-                ''', (f'%{search_text}%', limit))
+                cursor = conn.cursor()
+
+                if self._fts_enabled and terms:
+                    # Quote each word so it isn't read as FTS syntax, then
+                    # make it a prefix query
+                    query = ' '.join('"' + term.replace('"', '""') + '"*' for term in terms)
+                    cursor.execute('''
+                        SELECT m.* FROM messages m
+                        JOIN messages_fts f ON f.rowid = m.id
+                        WHERE messages_fts MATCH ?
+                        ORDER BY m.timestamp DESC
+                        LIMIT ?
+                    ''', (query, limit))
+                else:
+                    cursor.execute('''
+                        SELECT * FROM messages
+                        WHERE text LIKE ?
+                        ORDER BY timestamp DESC
+                        LIMIT ?
+                    ''', (f'%{search_text}%', limit))
 
                 rows = cursor.fetchall()
                 return [dict(row) for row in rows]
@@ -246,35 +591,43 @@ class DatabaseManager:
 
     def update_node(self, node_id: str, info: Dict = None):
         """Update or insert node information"""
+        info_json = _json_dumps(info) if info else None
+
         with self.lock:
             try:
-                cursor = self.conn.cursor()
-
-                # Check if node exists
-                cursor.execute('SELECT id FROM nodes WHERE node_id = ?', (node_id,))
-                exists = cursor.fetchone()
-
-                if exists:
-                    # Update existing node
-                    cursor.execute('''
-                        UPDATE nodes
-                        SET last_seen = CURRENT_TIMESTAMP,
-                            message_count = message_count + 1
-                        WHERE node_id = ?
-                    ''', (node_id,))
-                else:
-                    # Insert new node
-                    info_json = json.dumps(info) if info else None
-                    cursor.execute('''
-                        INSERT INTO nodes (node_id, info_json, message_count)
-                        VALUES (?, ?, 1)
-                    ''', (node_id, info_json))
-
+                self.conn.execute('''
+                    INSERT INTO nodes (node_id, info_json, message_count, first_seen, last_seen)
+                    VALUES (?, ?, 1, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
+                    ON CONFLICT(node_id) DO UPDATE SET
+                        last_seen = CURRENT_TIMESTAMP,
+                        message_count = message_count + 1,
+                        info_json = COALESCE(excluded.info_json, nodes.info_json)
+                ''', (node_id, info_json))
                 self.conn.commit()
 
             except Exception as e:
                 logger.error(f"Failed to update node: {e}")
 
+    def iter_nodes(self, active_hours: int = 24) -> Iterator[Dict]:
+        """
+        Stream nodes from database
+
+        Args:
+            active_hours: Only return nodes active in last N hours (0 for all)
+
+        Yields:
+            Node dictionaries, most recently seen first
+        """
+        if active_hours > 0:
+            cutoff = datetime.now() - timedelta(hours=active_hours)
+            return self._iter_rows('''
+                SELECT * FROM nodes
+                WHERE last_seen >= ?
+                ORDER BY last_seen DESC
+            ''', (_db_time(cutoff),))
+
+        return self._iter_rows('SELECT * FROM nodes ORDER BY last_seen DESC')
+
     def get_nodes(self, active_hours: int = 24) -> List[Dict]:
         """
         Get list of nodes
@@ -285,53 +638,56 @@ class DatabaseManager:
         Returns:
             List of node dictionaries
         """
-        with self.lock:
-            try:
-                cursor = self.conn.cursor()
-
-                if active_hours > 0:
-                    cutoff = datetime.now() - timedelta(hours=active_hours)
-                    cursor.execute('''
-                        SELECT * FROM nodes
-                        WHERE last_seen >= ?
-                        ORDER BY last_seen DESC
-                    ''', (cutoff,))
-                else:
-                    cursor.execute('SELECT * FROM nodes ORDER BY last_seen DESC')
-
-                rows = cursor.fetchall()
-                return [dict(row) for row in rows]
+        try:
+            return list(self.iter_nodes(active_hours))
 
-            except Exception as e:
-                logger.error(f"Failed to retrieve nodes: {e}")
-                return []
+        except Exception as e:
+            logger.error(f"Failed to retrieve nodes: {e}")
+            return []
 
     def record_statistics(self, radio_name: str, received: int, sent: int, errors: int, period: str = 'hourly'):
         """Record statistics snapshot"""
+        self.record_statistics_many([(radio_name, received, sent, errors)], period)
+
+    def record_statistics_many(self, rows: List[Tuple], period: str = 'hourly') -> bool:
+        """
+        Record statistics snapshots for several radios in a single transaction
+
+        Args:
+            rows: Tuples of (radio_name, received, sent, errors)
+            period: Period label applied to every row
+
+        Returns:
+            True if the batch was committed
+        """
+        if not rows:
+            return True
+
         with self.lock:
             try:
-                cursor = self.conn.cursor()
-                cursor.execute('''
-                    INSERT INTO statistics (radio_name, received, sent, errors, period)
-                    VALUES (?, ?, ?, ?, ?)
-                ''', (radio_name, received, sent, errors, period))
-                self.conn.commit()
+                with self.conn:
+                    self.conn.executemany('''
+                        INSERT INTO statistics (radio_name, received, sent, errors, period)
+                        VALUES (?, ?, ?, ?, ?)
+                    ''', [(*row, period) for row in rows])
+                return True
 
             except Exception as e:
                 logger.error(f"Failed to record statistics: {e}")
+                return False
 
     def get_statistics(self, hours: int = 24, period: str = 'hourly') -> List[Dict]:
         """Get statistics for the last N hours"""
-        with self.lock:
+        with self._reader() as conn:
             try:
-                cursor = self.conn.cursor()
+                cursor = conn.cursor()
                 cutoff = datetime.now() - timedelta(hours=hours)
 
                 cursor.execute('''
                     SELECT * FROM statistics
                     WHERE timestamp >= ? AND period = ?
                     ORDER BY timestamp DESC
-                ''', (cutoff, period))
+                ''', (_db_time(cutoff), period))
 
                 rows = cursor.fetchall()
                 return [dict(row) for row in rows]
@@ -342,25 +698,42 @@ class DatabaseManager:
 
     def log_event(self, event_type: str, description: str, data: Dict = None):
         """Log a system event"""
+        self.log_events([(event_type, description, data)])
+
+    def log_events(self, events: List[Tuple]) -> bool:
+        """
+        Log several system events in a single transaction
+
+        Args:
+            events: Tuples of (event_type, description, data)
+
+        Returns:
+            True if the batch was committed
+        """
+        if not events:
+            return True
+
+        rows = [(event_type, description, _json_dumps(data) if data else None)
+                for event_type, description, data in events]
+
         with self.lock:
             try:
-                cursor = self.conn.cursor()
-                data_json = json.dumps(data) if data else None
-
-                cursor.execute('''
-                    INSERT INTO events (event_type, description, data_json)
-                    VALUES (?, ?, ?)
-                ''', (event_type, description, data_json))
-                self.conn.commit()
+                with self.conn:
+                    self.conn.executemany('''
+                        INSERT INTO events (event_type, description, data_json)
+                        VALUES (?, ?, ?)
+                    ''', rows)
+                return True
 
             except Exception as e:
                 logger.error(f"Failed to log event: {e}")
+                return False
 
     def get_events(self, limit: int = 100, event_type: str = None) -> List[Dict]:
         """Retrieve system events"""
-        with self.lock:
+        with self._reader() as conn:
             try:
-                cursor = self.conn.cursor()
+                cursor = conn.cursor()
 
                 if event_type:
                     cursor.execute('''
@@ -385,51 +758,82 @@ class DatabaseManager:
 
     def cleanup_old_messages(self) -> int:
         """Delete messages older than retention period"""
-        with self.lock:
-            try:
-                cursor = self.conn.cursor()
-                cutoff = datetime.now() - timedelta(days=self.retention_days)
+        cutoff = datetime.now() - timedelta(days=self.retention_days)
+        deleted = 0
 
-                cursor.execute('DELETE FROM messages WHERE timestamp < ?', (cutoff,))
-                self.conn.commit()
+        try:
+            # Delete in bounded chunks, releasing the write lock between them
+            # so the bridge can keep writing during a large cleanup
+            while True:
+                with self.lock:
+                    cursor = self.conn.cursor()
+                    cursor.execute('''
+                        DELETE FROM messages WHERE id IN (
+                            SELECT id FROM messages
+                            WHERE timestamp < ?
+                            ORDER BY timestamp
+                            LIMIT ?
+                        )
+                    ''', (_db_time(cutoff), CLEANUP_CHUNK_SIZE))
+                    self.conn.commit()
 
-                deleted = cursor.rowcount
-                logger.info(f"Cleaned up {deleted} old messages")
-                return deleted
+                if cursor.rowcount <= 0:
+                    break
+                deleted += cursor.rowcount
 
-            except Exception as e:
-                logger.error(f"Failed to cleanup old messages: {e}")
-                return 0
+            # Fold the WAL back into the database file and shrink it
+            with self.lock:
+                self.conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
 
-    def get_summary_stats(self) -> Dict[str, Any]:
-        """Get summary statistics"""
-        with self.lock:
-            try:
-                cursor = self.conn.cursor()
+            logger.info(f"Cleaned up {deleted} old messages")
 
-                stats = {}
+        except Exception as e:
+            logger.error(f"Failed to cleanup old messages: {e}")
 
-                # Total messages
-                cursor.execute('SELECT COUNT(*) as count FROM messages')
-                stats['total_messages'] = cursor.fetchone()['count']
+        # Periodic cleanup is also when the counters are checked against the table
+        self._reconcile_counters()
+        return deleted
 
-                # Forwarded messages
-                cursor.execute('SELECT COUNT(*) as count FROM messages WHERE forwarded = 1')
-                stats['forwarded_messages'] = cursor.fetchone()['count']
+    def _reconcile_counters(self):
+        """Recount the maintained counters from the messages table"""
+        now = datetime.now()
+        today = now.replace(hour=0, minute=0, second=0, microsecond=0)
 
-                # Messages today
-                today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-                cursor.execute('SELECT COUNT(*) as count FROM messages WHERE timestamp >= ?', (today,))
-                stats['messages_today'] = cursor.fetchone()['count']
+        with self.lock:
+            try:
+                with self.conn:
+                    self.conn.execute('''
+                        INSERT INTO counters (name, value, day)
+                        VALUES ('messages_today',
+                                (SELECT COUNT(*) FROM messages WHERE timestamp >= ?), ?)
+                        ON CONFLICT(name) DO UPDATE SET
+                            value = excluded.value,
+                            day = excluded.day
+                    ''', (_db_time(today), now.date().isoformat()))
 
-                # Total nodes
-                cursor.execute('SELECT COUNT(*) as count FROM nodes')
-                stats['total_nodes'] = cursor.fetchone()['count']
+            except Exception as e:
+                logger.error(f"Failed to reconcile counters: {e}")
+
+    def get_summary_stats(self) -> Dict[str, Any]:
+        """Get summary statistics"""
+        with self._reader() as conn:
+            try:
+                cursor = conn.cursor()
 
-                # Active nodes (last 24 hours)
-                cutoff_24h = datetime.now() - timedelta(hours=24)
-                cursor.execute('SELECT COUNT(*) as count FROM nodes WHERE last_seen >= ?', (cutoff_24h,))
-                stats['active_nodes_24h'] = cursor.fetchone()['count']
+                # Message, counter and node totals in one round trip; scalar
+                # subqueries keep each count on its own index
+                now = datetime.now()
+                cutoff_24h = now - timedelta(hours=24)
+                cursor.execute('''
+                    SELECT
+                        (SELECT COUNT(*) FROM messages) AS total_messages,
+                        (SELECT COUNT(*) FROM messages WHERE forwarded = 1) AS forwarded_messages,
+                        COALESCE((SELECT CASE WHEN day = ? THEN value ELSE 0 END
+                                  FROM counters WHERE name = 'messages_today'), 0) AS messages_today,
+                        (SELECT COUNT(*) FROM nodes) AS total_nodes,
+                        (SELECT COUNT(*) FROM nodes WHERE last_seen >= ?) AS active_nodes_24h
+                ''', (now.date().isoformat(), _db_time(cutoff_24h)))
+                stats = dict(cursor.fetchone())
 
                 # Most active sender
                 cursor.execute('''
@@ -451,6 +855,15 @@ class DatabaseManager:
 
     def close(self):
         """Close database connection"""
+        with self._read_conns_lock:
+            read_conns, self._read_conns = self._read_conns, []
+
+        for conn in read_conns:
+            try:
+                conn.close()
+            except Exception as e:
+                logger.error(f"Error closing read connection: {e}")
+
         if self.conn:
             try:
                 self.conn.close()
@@ -4,12 +4,16 @@ Meshtastic Bridge GUI - Terminal UI for monitoring and controlling the bridge
 """
 
 import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from threading import Thread
 from textual.app import App, ComposeResult
 from textual.containers import Container, Horizontal, Vertical, ScrollableContainer
 from textual.widgets import Header, Footer, Static, Button, Input, DataTable, Log, Label
 from textual.binding import Binding
+from textual.worker import Worker, WorkerState
 from rich.text import Text
 from rich.table import Table
 from rich.panel import Panel
@@ -24,35 +28,45 @@ class StatsPanel(Static):
     def __init__(self, bridge):
         super().__init__()
         self.bridge = bridge
+        self._seen_version = None
 
-    def on_mount(self):
-        """Set up update timer"""
-        self.set_interval(1, self.update_stats)
-
-    def update_stats(self):
-        """Update statistics display"""
-        stats = self.bridge.get_stats()
-
+    @staticmethod
+    def _new_table() -> Table:
+        """Empty statistics table with its columns"""
         table = Table(box=box.ROUNDED, expand=True)
         table.add_column("Radio", style="cyan", width=12)
         table.add_column("Received", justify="right", style="green")
         table.add_column("Sent", justify="right", style="yellow")
         table.add_column("Errors", justify="right", style="red")
+        return table
+
+    def update_stats(self):
+        """Update statistics display"""
+        # Skip the snapshot and rebuild when the bridge reports no change
+        version = self.bridge.stats_version
+        if version == self._seen_version:
+            return
+        self._seen_version = version
+
+        stats = self.bridge.get_stats()
+        r1, r2 = stats['radio1'], stats['radio2']
+        tracker_stats = stats.get('tracker', {})
+
+        table = self._new_table()
 
         table.add_row(
             "Radio 1",
-            str(stats['radio1']['received']),
-            str(stats['radio1']['sent']),
-            str(stats['radio1']['errors'])
+            str(r1['received']),
+            str(r1['sent']),
+            str(r1['errors'])
         )
         table.add_row(
             "Radio 2",
-            str(stats['radio2']['received']),
-            str(stats['radio2']['sent']),
-            str(stats['radio2']['errors'])
+            str(r2['received']),
+            str(r2['sent']),
+            str(r2['errors'])
         )
 
-        tracker_stats = stats.get('tracker', {})
         table.add_row(
             "Total",
             str(tracker_stats.get('total_seen', 0)),
@@ -69,31 +83,41 @@ class NodeInfoPanel(Static):
     def __init__(self, bridge):
         super().__init__()
         self.bridge = bridge
+        self._last_key = None
 
-    def on_mount(self):
-        """Set up update timer"""
-        self.set_interval(5, self.update_info)
-        self.update_info()
-
-    def update_info(self):
-        """Update node information display"""
+    @staticmethod
+    def _new_table() -> Table:
+        """Empty node information table with its columns"""
         table = Table(box=box.ROUNDED, expand=True, title="Node Information")
         table.add_column("Radio", style="cyan", width=12)
         table.add_column("Status", style="green")
         table.add_column("Info")
+        return table
+
+    def on_mount(self):
+        """Show node information straight away"""
+        self.update_info()
 
+    def update_info(self):
+        """Update node information display"""
         # Radio 1 info
         info1 = self.bridge.get_node_info('radio1')
         status1 = "Connected" if self.bridge.interface1 else "Disconnected"
         info1_str = str(info1) if info1 else "No info available"
 
-        table.add_row("Radio 1", status1, info1_str[:50])
-
         # Radio 2 info
         info2 = self.bridge.get_node_info('radio2')
         status2 = "Connected" if self.bridge.interface2 else "Disconnected"
         info2_str = str(info2) if info2 else "No info available"
 
+        # Skip the rebuild when nothing has changed since the last tick
+        key = (status1, info1_str, status2, info2_str)
+        if key == self._last_key:
+            return
+        self._last_key = key
+
+        table = self._new_table()
+        table.add_row("Radio 1", status1, info1_str[:50])
         table.add_row("Radio 2", status2, info2_str[:50])
 
         self.update(table)
@@ -102,29 +126,45 @@ class NodeInfoPanel(Static):
 class MessageLog(Static):
     """Widget to display message log"""
 
+    # Messages kept on screen
+    MAX_MESSAGES = 30
+
+    STATUS_FORWARDED = "[green]✓[/green]"
+    STATUS_PENDING = "[yellow]•[/yellow]"
+
     def __init__(self, bridge):
         super().__init__()
         self.bridge = bridge
-        self.messages = []
+        self.messages = deque(maxlen=self.MAX_MESSAGES)
+        self._cursor = 0
+        self._seen_version = None
 
-    def on_mount(self):
-        """Set up update timer"""
-        self.set_interval(1, self.update_messages)
+    @staticmethod
+    def _format_message(msg) -> str:
+        """Format the fixed part of a message line, once when it arrives"""
+        timestamp = msg['timestamp'].strftime('%H:%M:%S')
+        from_node = msg['from'][-4:] if len(msg['from']) > 4 else msg['from']
+        text = msg['text'][:60]
+
+        return f"[{timestamp}] {from_node}: {text}"
 
     def update_messages(self):
         """Update message display"""
-        recent = self.bridge.get_recent_messages(30)
+        # Skip when no message arrived or changed state since the last tick
+        version = self.bridge.messages_version
+        if version == self._seen_version:
+            return
+        self._seen_version = version
 
-        # Build display text
-        lines = []
-        for msg in recent:
-            timestamp = msg['timestamp'].strftime('%H:%M:%S')
-            from_node = msg['from'][-4:] if len(msg['from']) > 4 else msg['from']
-            status = "[green]✓[/green]" if msg['forwarded'] else "[yellow]•[/yellow]"
-            text = msg['text'][:60]
+        # Only fetch messages that arrived since the last tick
+        new, self._cursor = self.bridge.get_messages_since(self._cursor, self.MAX_MESSAGES)
+        self.messages.extend((msg, self._format_message(msg)) for msg in new)
 
-            line = f"{status} [{timestamp}] {from_node}: {text}"
-            lines.append(line)
+        # Only the forwarded marker can change after arrival
+        lines = [
+            f"{self.STATUS_FORWARDED if msg['forwarded'] else self.STATUS_PENDING} {line}"
+            for msg, line in self.messages
+        ]
 
         content = "\n".join(lines) if lines else "[dim]No messages yet...[/dim]"
         self.update(content)
@@ -186,9 +226,72 @@ class MeshtasticBridgeApp(App):
         ("ctrl+c", "quit", "Quit"),
     ]
 
+    # Minimum seconds between messages sent to the radios
+    MIN_SEND_INTERVAL = 0.2
+
+    # All panels refresh from one timer; node info only every Nth tick
+    REFRESH_INTERVAL = 1.0
+    NODE_INFO_TICKS = 5
+
     def __init__(self, bridge):
         super().__init__()
         self.bridge = bridge
+        self._last_send_ts = 0.0
+        self._pending_sends = deque()
+        self._ticks = 0
+
+        # Radio I/O runs here so a stalled serial write can't freeze the UI;
+        # one worker keeps sends in order
+        self._io_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='gui-io')
+        self._quitting = False
+        self._stats_panel = StatsPanel(bridge)
+        self._node_panel = NodeInfoPanel(bridge)
+        self._message_log = MessageLog(bridge)
+
+    def on_mount(self):
+        """Set up the refresh and send queue timers"""
+        self.set_interval(self.REFRESH_INTERVAL, self._tick)
+        self.set_interval(self.MIN_SEND_INTERVAL, self._flush_pending_send)
+
+    def _tick(self):
+        """Refresh every panel in one pass so their redraws land in the same frame"""
+        self._ticks += 1
+        self._stats_panel.update_stats()
+        self._message_log.update_messages()
+        if self._ticks % self.NODE_INFO_TICKS == 0:
+            self._node_panel.update_info()
+
+    def _send(self, message: str, radio: str):
+        """Send now, or queue the message if the last send was too recent"""
+        now = time.monotonic()
+        if self._pending_sends or now - self._last_send_ts < self.MIN_SEND_INTERVAL:
+            self._pending_sends.append((message, radio))
+            return
+
+        self._last_send_ts = now
+        self._io_executor.submit(self.bridge.send_message, message, radio=radio, channel=0)
+
+    def _flush_pending_send(self):
+        """Send the oldest queued message once the send interval has passed"""
+        if not self._pending_sends:
+            return
+
+        now = time.monotonic()
+        if now - self._last_send_ts < self.MIN_SEND_INTERVAL:
+            return
+
+        message, radio = self._pending_sends.popleft()
+        self._last_send_ts = now
+        self._io_executor.submit(self.bridge.send_message, message, radio=radio, channel=0)
+
+    def _drain_sends(self, pending):
+        """Send queued messages in order, still spaced by MIN_SEND_INTERVAL (I/O thread)"""
+        for message, radio in pending:
+            wait = self.MIN_SEND_INTERVAL - (time.monotonic() - self._last_send_ts)
+            if wait > 0:
+                time.sleep(wait)
+            self._last_send_ts = time.monotonic()
+            self.bridge.send_message(message, radio=radio, channel=0)
 
     def compose(self) -> ComposeResult:
         """Compose the UI"""
@@ -197,17 +300,17 @@ class MeshtasticBridgeApp(App):
         # Stats panel
         with Container(id="stats-container"):
             yield Label("[b]Bridge Statistics[/b]", classes="panel-title")
-            yield StatsPanel(self.bridge)
+            yield self._stats_panel
 
         # Node info panel
         with Container(id="nodes-container"):
             yield Label("[b]Node Information[/b]", classes="panel-title")
-            yield NodeInfoPanel(self.bridge)
+            yield self._node_panel
 
         # Message log
         with Container(id="messages-container"):
             yield Label("[b]Message Log[/b]", classes="panel-title")
-            yield ScrollableContainer(MessageLog(self.bridge))
+            yield ScrollableContainer(self._message_log)
 
         # Input area
         with Container(id="input-container"):
@@ -228,9 +331,9 @@ class MeshtasticBridgeApp(App):
             return
 
         if event.button.id == "send-radio1":
-            self.bridge.send_message(message, radio='radio1', channel=0)
+            self._send(message, 'radio1')
         elif event.button.id == "send-radio2":
-            self.bridge.send_message(message, radio='radio2', channel=0)
+            self._send(message, 'radio2')
 
         # Clear input
         message_input.value = ""
@@ -241,7 +344,7 @@ class MeshtasticBridgeApp(App):
             # Default to radio 1
             message = event.input.value.strip()
             if message:
-                self.bridge.send_message(message, radio='radio1', channel=0)
+                self._send(message, 'radio1')
                 event.input.value = ""
 
     def action_refresh(self) -> None:
@@ -250,8 +353,24 @@ class MeshtasticBridgeApp(App):
 
     def action_quit(self) -> None:
         """Quit the application"""
-        self.bridge.close()
-        self.exit()
+        if self._quitting:
+            return
+        self._quitting = True
+
+        # Send whatever is still waiting for the rate limit, then close after
+        # all of those sends; exit once that has finished
+        pending = list(self._pending_sends)
+        self._pending_sends.clear()
+        if pending:
+            self._io_executor.submit(self._drain_sends, pending)
+        closed = self._io_executor.submit(self.bridge.close)
+        self._io_executor.shutdown(wait=False)
+        self.run_worker(closed.result, name="close-bridge", thread=True, exit_on_error=False)
+
+    def on_worker_state_changed(self, event: Worker.StateChanged) -> None:
+        """Exit once the bridge has closed"""
+        if event.worker.name == "close-bridge" and event.state in (WorkerState.SUCCESS, WorkerState.ERROR):
+            self.exit()
 
 
 def main():
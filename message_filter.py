@@ -6,11 +6,30 @@ Supports content-based and sender-based filtering
 
 import re
 import logging
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass
+from bisect import bisect_right
+from functools import lru_cache
+from typing import Dict, List, Optional, Any, Pattern
+from dataclasses import dataclass, field
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# Recent (from, channel, text) decisions kept, so retransmits skip filtering
+DECISION_CACHE_SIZE = 1024
+
+# Numbered or named backreference inside a regex pattern
+_BACKREF_RE = re.compile(r'\\[1-9]|\(\?P=')
+
+
+def _forward_all(message: Dict[str, Any]) -> bool:
+    """should_forward() stand-in while filtering is disabled"""
+    return True
+
 
 @dataclass
 class FilterRule:
@@ -21,6 +40,41 @@ class FilterRule:
     action: str  # 'allow', 'block'
     priority: int = 0
 
+    # Derived from pattern once, so matching does no per-message parsing
+    _compiled: Optional[Pattern] = field(default=None, init=False, repr=False, compare=False)
+    _pattern_lower: str = field(default='', init=False, repr=False, compare=False)
+    _channel_int: Optional[int] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        """Precompute the matcher state for this rule's type"""
+        if self.filter_type == 'regex':
+            try:
+                self._compiled = re.compile(self.pattern, re.IGNORECASE)
+            except re.error as e:
+                logger.error(f"Invalid regex in filter rule '{self.name}': {e}")
+        elif self.filter_type == 'keyword':
+            self._pattern_lower = self.pattern.lower()
+        elif self.filter_type == 'channel':
+            try:
+                self._channel_int = int(self.pattern)
+            except (ValueError, TypeError):
+                logger.error(f"Invalid channel in filter rule '{self.name}': {self.pattern}")
+
+
+class FilterStats:
+    """Filter counters, kept as slotted attributes rather than dict entries"""
+
+    __slots__ = ('total_checked', 'total_allowed', 'total_blocked',
+                 'blocked_by_sender', 'blocked_by_content', 'blocked_by_channel')
+
+    def __init__(self):
+        for name in self.__slots__:
+            setattr(self, name, 0)
+
+    def as_dict(self) -> Dict[str, int]:
+        """Snapshot of the counters"""
+        return {name: getattr(self, name) for name in self.__slots__}
+
 
 class MessageFilter:
     """Filter messages based on configurable rules"""
@@ -34,12 +88,15 @@ class MessageFilter:
         """
         self.config = config or {}
         self.enabled = self.config.get('enabled', False)
-        self.whitelist_nodes = set(self.config.get('whitelist_nodes', []))
-        self.blacklist_nodes = set(self.config.get('blacklist_nodes', []))
+        self.whitelist_nodes = frozenset(self.config.get('whitelist_nodes', []))
+        self.blacklist_nodes = frozenset(self.config.get('blacklist_nodes', []))
 
         # Content filters
         content_filters = self.config.get('content_filters', {})
         self.keywords = set(content_filters.get('keywords', []))
+        self._kw_automaton = None
+        self._keywords_lower = ()
+        self._build_keyword_matcher()
 
         # Compile regex patterns
         self.regex_patterns = []
@@ -49,23 +106,123 @@ class MessageFilter:
             except re.error as e:
                 logger.error(f"Invalid regex pattern '{pattern}': {e}")
 
+        # One alternation so the text is scanned once instead of per pattern;
+        # the individual patterns are kept for diagnostics and as a fallback
+        self._combined_regex = self._combine_patterns(self.regex_patterns)
+
         # Channel filters
-        self.allowed_channels = set(self.config.get('allowed_channels', []))
-        self.blocked_channels = set(self.config.get('blocked_channels', []))
+        self.allowed_channels = frozenset(self.config.get('allowed_channels', []))
+        self.blocked_channels = frozenset(self.config.get('blocked_channels', []))
+
+        # Decisions for recently seen messages (Meshtastic retransmits repeat them)
+        self._decide = lru_cache(maxsize=DECISION_CACHE_SIZE)(self._compute_decision)
 
         # Custom filter rules
         self.custom_rules: List[FilterRule] = []
+        # Negated priorities parallel to custom_rules, kept ascending for bisect
+        self._rule_keys: List[int] = []
+        self._rule_matchers = {
+            'keyword': self._match_keyword,
+            'regex': self._match_regex,
+            'sender': self._match_sender,
+            'channel': self._match_channel
+        }
         self._load_custom_rules()
 
+        # Which checks the current configuration actually needs
+        self._plan_checks()
+
         # Statistics
-        self.stats = {
-            'total_checked': 0,
-            'total_allowed': 0,
-            'total_blocked': 0,
-            'blocked_by_sender': 0,
-            'blocked_by_content': 0,
-            'blocked_by_channel': 0
-        }
+        self.stats = FilterStats()
+
+        # Disabled filters skip should_forward() entirely
+        if not self.enabled:
+            self.should_forward = _forward_all
+
+    def enable(self):
+        """Enable filtering"""
+        self.enabled = True
+        # Drop the instance override so the class method is used again
+        self.__dict__.pop('should_forward', None)
+        logger.info("Message filtering enabled")
+
+    def disable(self):
+        """Disable filtering (every message is forwarded)"""
+        self.enabled = False
+        self.should_forward = _forward_all
+        logger.info("Message filtering disabled")
+
+    def _build_keyword_matcher(self):
+        """
+        Build the keyword matcher
+
+        Uses an Aho-Corasick automaton over the lowercased keywords when
+        pyahocorasick is installed, otherwise plain substring checks of the
+        lowercased keywords against the lowercased text (much cheaper than a
+        case-insensitive regex for the handful of keywords usually configured).
+        """
+        self._kw_automaton = None
+        self._keywords_lower = ()
+
+        keywords = [kw for kw in self.keywords if kw]
+        if not keywords:
+            return
+
+        if AHOCORASICK_AVAILABLE:
+            automaton = ahocorasick.Automaton()
+            for keyword in keywords:
+                keyword_lower = keyword.lower()
+                automaton.add_word(keyword_lower, keyword_lower)
+            automaton.make_automaton()
+            self._kw_automaton = automaton
+        else:
+            self._keywords_lower = tuple(kw.lower() for kw in keywords)
+
+    @staticmethod
+    def _combine_patterns(patterns: List[Pattern]) -> Optional[Pattern]:
+        """
+        Combine compiled patterns into one alternation
+
+        Returns:
+            Combined pattern, or None to check the patterns one by one
+        """
+        if len(patterns) < 2:
+            return None
+
+        # Group numbers shift inside an alternation, so backreferences would
+        # silently change meaning
+        if any(_BACKREF_RE.search(p.pattern) for p in patterns):
+            return None
+
+        try:
+            return re.compile('|'.join(f'(?:{p.pattern})' for p in patterns), re.IGNORECASE)
+        except re.error as e:
+            logger.debug("Could not combine regex patterns, checking individually: %s", e)
+            return None
+
+    def _plan_checks(self):
+        """
+        Work out which checks the current configuration needs
+
+        Unconfigured filters are skipped in _compute_decision without
+        touching their sets or patterns, and the text is only lowercased
+        when a content filter or custom rule will look at it.
+        """
+        self._has_whitelist = bool(self.whitelist_nodes)
+        self._has_blacklist = bool(self.blacklist_nodes)
+        self._has_allowed_channels = bool(self.allowed_channels)
+        self._has_blocked_channels = bool(self.blocked_channels)
+        self._has_content_filters = bool(
+            self._kw_automaton is not None or self._keywords_lower or self.regex_patterns
+        )
+
+        # Resolve each rule's matcher once; rules of unknown type never match
+        self._rule_checks = tuple(
+            (rule, self._rule_matchers[rule.filter_type])
+            for rule in self.custom_rules
+            if rule.filter_type in self._rule_matchers
+        )
+        self._has_custom_rules = bool(self._rule_checks)
 
     def _load_custom_rules(self):
         """Load custom filter rules from configuration"""
@@ -80,12 +237,20 @@ class MessageFilter:
                     action=rule_data.get('action', 'allow'),
                     priority=rule_data.get('priority', 0)
                 )
-                self.custom_rules.append(rule)
+                self._insert_rule(rule)
             except Exception as e:
                 logger.error(f"Failed to load custom rule: {e}")
 
-        # Sort by priority (higher priority first)
-        self.custom_rules.sort(key=lambda r: r.priority, reverse=True)
+    def _insert_rule(self, rule: FilterRule):
+        """
+        Insert a rule keeping custom_rules ordered by priority (highest first)
+
+        Rules with equal priority keep the order they were added in.
+        """
+        key = -rule.priority
+        index = bisect_right(self._rule_keys, key)
+        self._rule_keys.insert(index, key)
+        self.custom_rules.insert(index, rule)
 
     def should_forward(self, message: Dict[str, Any]) -> bool:
         """
@@ -100,64 +265,94 @@ class MessageFilter:
         if not self.enabled:
             return True
 
-        self.stats['total_checked'] += 1
+        self.stats.total_checked += 1
 
-        from_node = message.get('from', '')
-        text = message.get('text', '')
-        channel = message.get('channel', 0)
+        reason = self._decide(
+            message.get('from', ''),
+            message.get('channel', 0),
+            message.get('text', '')
+        )
 
+        if reason is None:
+            # Message passes all filters
+            self.stats.total_allowed += 1
+            return True
+
+        self.stats.total_blocked += 1
+        if reason == 'sender':
+            self.stats.blocked_by_sender += 1
+        elif reason == 'channel':
+            self.stats.blocked_by_channel += 1
+        elif reason == 'content':
+            self.stats.blocked_by_content += 1
+        return False
+
+    def _compute_decision(self, from_node: str, channel: int, text: str) -> Optional[str]:
+        """
+        Run every filter against a message
+
+        Only depends on its arguments and the filter configuration, so the
+        result is cached in self._decide until the configuration changes.
+
+        Returns:
+            None if the message is allowed, otherwise why it was blocked:
+            'sender', 'channel', 'content' or 'custom'
+        """
         # Check sender whitelist (takes precedence)
-        if self.whitelist_nodes:
+        if self._has_whitelist:
             if from_node not in self.whitelist_nodes:
-                self.stats['total_blocked'] += 1
-                self.stats['blocked_by_sender'] += 1
-                logger.debug(f"Blocked message from {from_node}: not in whitelist")
-                return False
+                logger.debug("Blocked message from %s: not in whitelist", from_node)
+                return 'sender'
 
         # Check sender blacklist
-        if from_node in self.blacklist_nodes:
-            self.stats['total_blocked'] += 1
-            self.stats['blocked_by_sender'] += 1
-            logger.debug(f"Blocked message from {from_node}: in blacklist")
-            return False
+        if self._has_blacklist:
+            if from_node in self.blacklist_nodes:
+                logger.debug("Blocked message from %s: in blacklist", from_node)
+                return 'sender'
 
         # Check channel filters
-        if self.allowed_channels:
+        if self._has_allowed_channels:
             if channel not in self.allowed_channels:
-                self.stats['total_blocked'] += 1
-                self.stats['blocked_by_channel'] += 1
-                logger.debug(f"Blocked message on channel {channel}: not in allowed channels")
-                return False
+                logger.debug("Blocked message on channel %s: not in allowed channels", channel)
+                return 'channel'
+
+        if self._has_blocked_channels:
+            if channel in self.blocked_channels:
+                logger.debug("Blocked message on channel %s: in blocked channels", channel)
+                return 'channel'
 
-        if channel in self.blocked_channels:
-            self.stats['total_blocked'] += 1
-            self.stats['blocked_by_channel'] += 1
-            logger.debug(f"Blocked message on channel {channel}: in blocked channels")
-            return False
+        if not (self._has_content_filters or self._has_custom_rules):
+            return None
+
+        # Lowercased once here; the content and rule checks all reuse it
+        text_lower = text.lower()
 
         # Check content filters
-        if not self._check_content(text):
-            self.stats['total_blocked'] += 1
-            self.stats['blocked_by_content'] += 1
-            logger.debug(f"Blocked message from {from_node}: content filter match")
-            return False
+        if self._has_content_filters:
+            if not self._check_content(text, text_lower):
+                logger.debug("Blocked message from %s: content filter match", from_node)
+                return 'content'
 
         # Check custom rules
-        if not self._check_custom_rules(message):
-            self.stats['total_blocked'] += 1
-            logger.debug(f"Blocked message from {from_node}: custom rule match")
-            return False
+        if self._has_custom_rules:
+            if not self._check_custom_rules(from_node, text, text_lower, channel):
+                logger.debug("Blocked message from %s: custom rule match", from_node)
+                return 'custom'
 
-        # Message passes all filters
-        self.stats['total_allowed'] += 1
-        return True
+        return None
 
-    def _check_content(self, text: str) -> bool:
+    def _invalidate_decisions(self):
+        """Re-plan the checks and forget cached decisions after a configuration change"""
+        self._plan_checks()
+        self._decide.cache_clear()
+
+    def _check_content(self, text: str, text_lower: str) -> bool:
         """
         Check if message content passes filters
 
         Args:
             text: Message text content
+            text_lower: text.lower(), computed once by the caller
 
         Returns:
             True if content is allowed, False if blocked
@@ -165,85 +360,80 @@ class MessageFilter:
         if not text:
             return True
 
-        text_lower = text.lower()
-
         # Check keywords
-        for keyword in self.keywords:
-            if keyword.lower() in text_lower:
-                logger.debug(f"Content blocked: keyword '{keyword}' found")
+        if self._kw_automaton is not None:
+            match = next(self._kw_automaton.iter(text_lower), None)
+            if match is not None:
+                logger.debug("Content blocked: keyword '%s' found", match[1])
                 return False
+        else:
+            for keyword in self._keywords_lower:
+                if keyword in text_lower:
+                    logger.debug("Content blocked: keyword '%s' found", keyword)
+                    return False
 
         # Check regex patterns
+        if self._combined_regex:
+            if not self._combined_regex.search(text):
+                return True
+
         for pattern in self.regex_patterns:
             if pattern.search(text):
-                logger.debug(f"Content blocked: regex pattern '{pattern.pattern}' matched")
+                logger.debug("Content blocked: regex pattern '%s' matched", pattern.pattern)
                 return False
 
         return True
 
-    def _check_custom_rules(self, message: Dict[str, Any]) -> bool:
+    def _check_custom_rules(self, from_node: str, text: str, text_lower: str, channel: int) -> bool:
         """
         Check custom filter rules
 
         Args:
-            message: Full message dictionary
+            from_node: Sender node ID
+            text: Message text content
+            text_lower: Lowercased message text, used by case-insensitive rules
+            channel: Channel index
 
         Returns:
             True if message is allowed, False if blocked
         """
-        for rule in self.custom_rules:
-            if self._evaluate_rule(rule, message):
+        for rule, matcher in self._rule_checks:
+            if matcher(rule, from_node, text, text_lower, channel):
                 # Rule matched
                 if rule.action == 'block':
-                    logger.debug(f"Custom rule '{rule.name}' blocked message")
+                    logger.debug("Custom rule '%s' blocked message", rule.name)
                     return False
                 elif rule.action == 'allow':
-                    logger.debug(f"Custom rule '{rule.name}' allowed message")
+                    logger.debug("Custom rule '%s' allowed message", rule.name)
                     return True
 
         # No custom rules matched, allow by default
         return True
 
-    def _evaluate_rule(self, rule: FilterRule, message: Dict[str, Any]) -> bool:
-        """
-        Evaluate if a rule matches a message
-
-        Args:
-            rule: FilterRule to evaluate
-            message: Message dictionary
+    @staticmethod
+    def _match_keyword(rule: FilterRule, from_node: str, text: str, text_lower: str, channel: int) -> bool:
+        """Case-insensitive substring match on message text"""
+        return rule._pattern_lower in text_lower
 
-        Returns:
-            True if rule matches, False otherwise
-        """
-        if rule.filter_type == 'keyword':
-            text = message.get('text', '')
-            return rule.pattern.lower() in text.lower()
+    @staticmethod
+    def _match_regex(rule: FilterRule, from_node: str, text: str, text_lower: str, channel: int) -> bool:
+        """Precompiled regex search on message text"""
+        return rule._compiled is not None and rule._compiled.search(text) is not None
 
-        elif rule.filter_type == 'regex':
-            text = message.get('text', '')
-            try:
-                pattern = re.compile(rule.pattern, re.IGNORECASE)
-                return bool(pattern.search(text))
-            except re.error:
-                return False
+    @staticmethod
+    def _match_sender(rule: FilterRule, from_node: str, text: str, text_lower: str, channel: int) -> bool:
+        """Substring match on sender node ID"""
+        return rule.pattern in from_node
 
-        elif rule.filter_type == 'sender':
-            from_node = message.get('from', '')
-            return rule.pattern in from_node
-
-        elif rule.filter_type == 'channel':
-            channel = message.get('channel', 0)
-            try:
-                return channel == int(rule.pattern)
-            except (ValueError, TypeError):
-                return False
-
-        return False
+    @staticmethod
+    def _match_channel(rule: FilterRule, from_node: str, text: str, text_lower: str, channel: int) -> bool:
+        """Exact match on channel index"""
+        return rule._channel_int is not None and channel == rule._channel_int
 
     def add_rule(self, rule: FilterRule):
         """Add a custom filter rule"""
-        self.custom_rules.append(rule)
-        self.custom_rules.sort(key=lambda r: r.priority, reverse=True)
+        self._insert_rule(rule)
+        self._invalidate_decisions()
         logger.info(f"Added filter rule: {rule.name}")
 
     def remove_rule(self, name: str) -> bool:
@@ -251,44 +441,57 @@ class MessageFilter:
         for i, rule in enumerate(self.custom_rules):
             if rule.name == name:
                 self.custom_rules.pop(i)
+                self._rule_keys.pop(i)
+                self._invalidate_decisions()
                 logger.info(f"Removed filter rule: {name}")
                 return True
         return False
 
+    def add_keyword(self, keyword: str):
+        """Add a blocked keyword"""
+        self.keywords.add(keyword)
+        self._build_keyword_matcher()
+        self._invalidate_decisions()
+        logger.info(f"Added keyword filter: {keyword}")
+
+    def remove_keyword(self, keyword: str):
+        """Remove a blocked keyword"""
+        self.keywords.discard(keyword)
+        self._build_keyword_matcher()
+        self._invalidate_decisions()
+        logger.info(f"Removed keyword filter: {keyword}")
+
     def add_whitelist_node(self, node_id: str):
         """Add a node to the whitelist"""
-        self.whitelist_nodes.add(node_id)
+        self.whitelist_nodes = self.whitelist_nodes | {node_id}
+        self._invalidate_decisions()
         logger.info(f"Added node to whitelist: {node_id}")
 
     def add_blacklist_node(self, node_id: str):
         """Add a node to the blacklist"""
-        self.blacklist_nodes.add(node_id)
+        self.blacklist_nodes = self.blacklist_nodes | {node_id}
+        self._invalidate_decisions()
         logger.info(f"Added node to blacklist: {node_id}")
 
     def remove_whitelist_node(self, node_id: str):
         """Remove a node from the whitelist"""
-        self.whitelist_nodes.discard(node_id)
+        self.whitelist_nodes = self.whitelist_nodes - {node_id}
+        self._invalidate_decisions()
         logger.info(f"Removed node from whitelist: {node_id}")
 
     def remove_blacklist_node(self, node_id: str):
         """Remove a node from the blacklist"""
-        self.blacklist_nodes.discard(node_id)
+        self.blacklist_nodes = self.blacklist_nodes - {node_id}
+        self._invalidate_decisions()
         logger.info(f"Removed node from blacklist: {node_id}")
 
     def get_stats(self) -> Dict[str, int]:
         """Get filter statistics"""
-        return self.stats.copy()
+        return self.stats.as_dict()
 
     def reset_stats(self):
         """Reset filter statistics"""
-        self.stats = {
-            'total_checked': 0,
-            'total_allowed': 0,
-            'total_blocked': 0,
-            'blocked_by_sender': 0,
-            'blocked_by_content': 0,
-            'blocked_by_channel': 0
-        }
+        self.stats = FilterStats()
         logger.info("Filter statistics reset")
 
 
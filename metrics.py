@@ -6,36 +6,182 @@ Provides metrics endpoint for monitoring
 
 import logging
 import time
-from http.server import HTTPServer, BaseHTTPRequestHandler
-from threading import Thread, Lock
-from typing import Dict, Any, Optional
+from array import array
+from collections import defaultdict
+from itertools import count as count_from
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from threading import Thread, Lock, local, current_thread
+from typing import Dict, Any, Optional, Hashable, Tuple
 from datetime import datetime
 
+try:
+    from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+    PROMETHEUS_CLIENT_AVAILABLE = True
+except ImportError:
+    PROMETHEUS_CLIENT_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Number of recent processing time measurements kept for the average
+# (a power of two, so the ring buffer index is a mask)
+PROCESSING_TIME_SAMPLES = 1024
+
+# Seconds a rendered /metrics payload is reused for repeated scrapes
+EXPORT_CACHE_TTL = 1.0
+
+# Seconds an idle keep-alive connection may hold a server thread. Longer
+# than Prometheus' default 15s scrape interval, so scrapers reuse it
+HTTP_IDLE_TIMEOUT = 20.0
+
+# Prometheus exposition text; only the values are filled in per scrape
+_PROM_TEMPLATE = (
+    '# HELP meshtastic_bridge_info Bridge information\n'
+    '# TYPE meshtastic_bridge_info gauge\n'
+    'meshtastic_bridge_info{{version="2.0"}} 1\n'
+    '\n'
+    '# HELP meshtastic_bridge_uptime_seconds Bridge uptime in seconds\n'
+    '# TYPE meshtastic_bridge_uptime_seconds gauge\n'
+    'meshtastic_bridge_uptime_seconds {uptime:.2f}\n'
+    '\n'
+    '# HELP meshtastic_messages_received_total Total messages received per radio\n'
+    '# TYPE meshtastic_messages_received_total counter\n'
+    'meshtastic_messages_received_total{{radio="radio1"}} {received_radio1}\n'
+    'meshtastic_messages_received_total{{radio="radio2"}} {received_radio2}\n'
+    '\n'
+    '# HELP meshtastic_messages_sent_total Total messages sent per radio\n'
+    '# TYPE meshtastic_messages_sent_total counter\n'
+    'meshtastic_messages_sent_total{{radio="radio1"}} {sent_radio1}\n'
+    'meshtastic_messages_sent_total{{radio="radio2"}} {sent_radio2}\n'
+    '\n'
+    '# HELP meshtastic_messages_errors_total Total message errors per radio\n'
+    '# TYPE meshtastic_messages_errors_total counter\n'
+    'meshtastic_messages_errors_total{{radio="radio1"}} {errors_radio1}\n'
+    'meshtastic_messages_errors_total{{radio="radio2"}} {errors_radio2}\n'
+    '\n'
+    '# HELP meshtastic_messages_forwarded_total Total messages forwarded\n'
+    '# TYPE meshtastic_messages_forwarded_total counter\n'
+    'meshtastic_messages_forwarded_total {forwarded}\n'
+    '\n'
+    '# HELP meshtastic_messages_dropped_total Total messages dropped\n'
+    '# TYPE meshtastic_messages_dropped_total counter\n'
+    'meshtastic_messages_dropped_total {dropped}\n'
+    '\n'
+    '# HELP meshtastic_messages_filtered_total Total messages filtered\n'
+    '# TYPE meshtastic_messages_filtered_total counter\n'
+    'meshtastic_messages_filtered_total {filtered}\n'
+    '\n'
+    '# HELP meshtastic_connected_radios Number of connected radios\n'
+    '# TYPE meshtastic_connected_radios gauge\n'
+    'meshtastic_connected_radios {connected_radios}\n'
+    '\n'
+    '# HELP meshtastic_active_nodes Number of active nodes\n'
+    '# TYPE meshtastic_active_nodes gauge\n'
+    'meshtastic_active_nodes {active_nodes}\n'
+    '\n'
+    '# HELP meshtastic_tracked_messages Number of currently tracked messages\n'
+    '# TYPE meshtastic_tracked_messages gauge\n'
+    'meshtastic_tracked_messages {tracked_messages}\n'
+)
+
+_PROM_PROCESSING_TEMPLATE = (
+    '\n'
+    '# HELP meshtastic_message_processing_time_ms Message processing time statistics\n'
+    '# TYPE meshtastic_message_processing_time_ms gauge\n'
+    'meshtastic_message_processing_time_ms{{stat="avg"}} {avg:.2f}\n'
+    'meshtastic_message_processing_time_ms{{stat="max"}} {max:.2f}\n'
+    'meshtastic_message_processing_time_ms{{stat="min"}} {min:.2f}\n'
+)
+
+_PROM_NODE_HEADER = (
+    '\n'
+    '# HELP meshtastic_node_messages_total Total messages per node\n'
+    '# TYPE meshtastic_node_messages_total counter\n'
+)
+_PROM_NODE_LINE = 'meshtastic_node_messages_total{node_id="%s"} %d\n'
+
+# Label values must escape backslash, double quote and newline
+_PROM_LABEL_ESCAPE = str.maketrans({'\\': '\\\\', '"': '\\"', '\n': '\\n'})
+
+
+class StripedCounters:
+    """
+    Counters striped across per-thread cells
+
+    Each thread increments plain ints in its own defaultdict, so the hot path
+    takes no lock; cells are only summed (under a lock) when the counters are
+    read.
+    Cells of threads that have exited are folded into a retired total.
+    """
+
+    def __init__(self):
+        """Initialize striped counters"""
+        self._local = local()
+        self._lock = Lock()
+        self._cells = []
+        self._retired: Dict[Hashable, int] = defaultdict(int)
+
+    def add(self, key: Hashable, count: int = 1):
+        """Add to a counter from the calling thread"""
+        try:
+            cell = self._local.cell
+        except AttributeError:
+            cell = self._register()
+        cell[key] += count
+
+    def _register(self) -> Dict[Hashable, int]:
+        """Create and register the calling thread's cell"""
+        cell = defaultdict(int)
+        self._local.cell = cell
+        with self._lock:
+            self._cells.append((current_thread(), cell))
+        return cell
+
+    def snapshot(self) -> Dict[Hashable, int]:
+        """
+        Sum all cells
+
+        Returns:
+            Dictionary of counter key to total
+        """
+        with self._lock:
+            totals = self._retired.copy()
+            live = []
+            for thread, cell in self._cells:
+                alive = thread.is_alive()
+                # Copying a dict is atomic under the GIL, so the owner thread
+                # can keep incrementing while we read
+                for key, value in cell.copy().items():
+                    totals[key] += value
+                if alive:
+                    live.append((thread, cell))
+                else:
+                    for key, value in cell.items():
+                        self._retired[key] += value
+            self._cells = live
+            return dict(totals)
+
 
 class MetricsCollector:
     """Collects and exposes Prometheus metrics"""
 
+    # Radio labels the per-radio counters accept (the ones in _PROM_TEMPLATE)
+    RADIOS = ('radio1', 'radio2')
+
     def __init__(self):
         """Initialize metrics collector"""
-        self.lock = Lock()
+        # Counter metrics, keyed by (metric, label) and summed on export
+        self.counters = StripedCounters()
 
-        # Counter metrics
-        self.messages_received_total = {'radio1': 0, 'radio2': 0}
-        self.messages_sent_total = {'radio1': 0, 'radio2': 0}
-        self.messages_errors_total = {'radio1': 0, 'radio2': 0}
-        self.messages_forwarded_total = 0
-        self.messages_dropped_total = 0
-        self.messages_filtered_total = 0
-
-        # Gauge metrics
+        # Gauge metrics (single stores, so set without a lock)
         self.connected_radios = 0
         self.active_nodes = 0
         self.tracked_messages = 0
 
-        # Histogram/timing metrics
-        self.message_processing_times = []
+        # Histogram/timing metrics: a ring buffer written without a lock;
+        # next() on itertools.count is atomic, so each sample gets its own slot
+        self.message_processing_times = array('d', [0.0] * PROCESSING_TIME_SAMPLES)
+        self._processing_time_index = count_from()
+        self._processing_time_samples = 0
         self.max_processing_time = 0
         self.min_processing_time = float('inf')
 
@@ -43,80 +189,155 @@ class MetricsCollector:
         self.start_time = time.time()
 
         # Node statistics
-        self.node_message_counts: Dict[str, int] = {}
+        self.node_message_counts = StripedCounters()
+
+        # Last rendered /metrics payload
+        self._export_lock = Lock()
+        self._cached_payload = b''
+        self._cached_at = 0.0
 
     def increment_received(self, radio: str, count: int = 1):
         """Increment received message counter"""
-        with self.lock:
-            if radio in self.messages_received_total:
-                self.messages_received_total[radio] += count
+        if radio in self.RADIOS:
+            self.counters.add(('received', radio), count)
 
     def increment_sent(self, radio: str, count: int = 1):
         """Increment sent message counter"""
-        with self.lock:
-            if radio in self.messages_sent_total:
-                self.messages_sent_total[radio] += count
+        if radio in self.RADIOS:
+            self.counters.add(('sent', radio), count)
 
     def increment_errors(self, radio: str, count: int = 1):
         """Increment error counter"""
-        with self.lock:
-            if radio in self.messages_errors_total:
-                self.messages_errors_total[radio] += count
+        if radio in self.RADIOS:
+            self.counters.add(('errors', radio), count)
 
     def increment_forwarded(self, count: int = 1):
         """Increment forwarded message counter"""
-        with self.lock:
-            self.messages_forwarded_total += count
+        self.counters.add('forwarded', count)
 
     def increment_dropped(self, count: int = 1):
         """Increment dropped message counter"""
-        with self.lock:
-            self.messages_dropped_total += count
+        self.counters.add('dropped', count)
 
     def increment_filtered(self, count: int = 1):
         """Increment filtered message counter"""
-        with self.lock:
-            self.messages_filtered_total += count
+        self.counters.add('filtered', count)
 
     def set_connected_radios(self, count: int):
         """Set number of connected radios"""
-        with self.lock:
-            self.connected_radios = count
+        self.connected_radios = count
 
     def set_active_nodes(self, count: int):
         """Set number of active nodes"""
-        with self.lock:
-            self.active_nodes = count
+        self.active_nodes = count
 
     def set_tracked_messages(self, count: int):
         """Set number of tracked messages"""
-        with self.lock:
-            self.tracked_messages = count
+        self.tracked_messages = count
 
     def record_processing_time(self, duration_ms: float):
         """Record message processing time"""
-        with self.lock:
-            self.message_processing_times.append(duration_ms)
-
-            # Keep only last 1000 measurements
-            if len(self.message_processing_times) > 1000:
-                self.message_processing_times.pop(0)
+        index = next(self._processing_time_index)
+        self.message_processing_times[index & (PROCESSING_TIME_SAMPLES - 1)] = duration_ms
+        self._processing_time_samples = index + 1
 
-            self.max_processing_time = max(self.max_processing_time, duration_ms)
-            if duration_ms > 0:
-                self.min_processing_time = min(self.min_processing_time, duration_ms)
+        # Unsynchronized compare-and-store; a race can at worst miss one
+        # extreme, which is fine for monitoring
+        if duration_ms > self.max_processing_time:
+            self.max_processing_time = duration_ms
+        if 0 < duration_ms < self.min_processing_time:
+            self.min_processing_time = duration_ms
 
     def increment_node_messages(self, node_id: str, count: int = 1):
         """Increment message count for a specific node"""
-        with self.lock:
-            if node_id not in self.node_message_counts:
-                self.node_message_counts[node_id] = 0
-            self.node_message_counts[node_id] += count
+        self.node_message_counts.add(node_id, count)
 
     def get_uptime_seconds(self) -> float:
         """Get uptime in seconds"""
         return time.time() - self.start_time
 
+    def _processing_stats(self) -> Optional[Tuple[float, float, float]]:
+        """
+        Summarize the processing time ring buffer
+
+        Unfilled slots are 0.0, so summing the whole buffer is correct before
+        it wraps; the sum over the array runs in C.
+
+        Returns:
+            Tuple of (avg, max, min) in ms, or None before the first sample
+        """
+        sample_count = min(self._processing_time_samples, PROCESSING_TIME_SAMPLES)
+        if not sample_count:
+            return None
+        return (sum(self.message_processing_times) / sample_count,
+                self.max_processing_time,
+                self.min_processing_time)
+
+    def collect(self):
+        """
+        Yield metrics for a prometheus_client registry
+
+        Lets the bridge metrics be served by an existing prometheus_client
+        exporter with REGISTRY.register(collector). Requires prometheus_client.
+        """
+        if not PROMETHEUS_CLIENT_AVAILABLE:
+            raise ImportError("prometheus_client not installed. Install with: pip install prometheus-client")
+
+        counters = self.counters.snapshot()
+
+        for kind, doc in (('received', 'Total messages received per radio'),
+                          ('sent', 'Total messages sent per radio'),
+                          ('errors', 'Total message errors per radio')):
+            family = CounterMetricFamily(f'meshtastic_messages_{kind}', doc, labels=['radio'])
+            for radio in self.RADIOS:
+                family.add_metric([radio], counters.get((kind, radio), 0))
+            yield family
+
+        for kind in ('forwarded', 'dropped', 'filtered'):
+            yield CounterMetricFamily(f'meshtastic_messages_{kind}',
+                                      f'Total messages {kind}',
+                                      value=counters.get(kind, 0))
+
+        yield GaugeMetricFamily('meshtastic_bridge_uptime_seconds', 'Bridge uptime in seconds',
+                                value=self.get_uptime_seconds())
+        yield GaugeMetricFamily('meshtastic_connected_radios', 'Number of connected radios',
+                                value=self.connected_radios)
+        yield GaugeMetricFamily('meshtastic_active_nodes', 'Number of active nodes',
+                                value=self.active_nodes)
+        yield GaugeMetricFamily('meshtastic_tracked_messages', 'Number of currently tracked messages',
+                                value=self.tracked_messages)
+
+        processing_stats = self._processing_stats()
+        if processing_stats:
+            family = GaugeMetricFamily('meshtastic_message_processing_time_ms',
+                                       'Message processing time statistics', labels=['stat'])
+            for stat, value in zip(('avg', 'max', 'min'), processing_stats):
+                family.add_metric([stat], value)
+            yield family
+
+        family = CounterMetricFamily('meshtastic_node_messages', 'Total messages per node',
+                                     labels=['node_id'])
+        for node_id, count in self.node_message_counts.snapshot().items():
+            family.add_metric([node_id], count)
+        yield family
+
+    def get_prometheus_payload(self) -> bytes:
+        """
+        Get the encoded Prometheus payload for the /metrics endpoint
+
+        Scrapes within EXPORT_CACHE_TTL seconds of each other share one
+        rendering; concurrent scrapes wait for it instead of rendering again.
+
+        Returns:
+            Metrics in Prometheus text format, UTF-8 encoded
+        """
+        with self._export_lock:
+            now = time.monotonic()
+            if not self._cached_payload or now - self._cached_at >= EXPORT_CACHE_TTL:
+                self._cached_payload = self.export_prometheus().encode('utf-8')
+                self._cached_at = now
+            return self._cached_payload
+
     def export_prometheus(self) -> str:
         """
         Export metrics in Prometheus format
@@ -124,100 +345,40 @@ class MetricsCollector:
         Returns:
             Metrics in Prometheus text format
         """
-        with self.lock:
-            lines = []
-
-            # Add header
-            lines.append('# HELP meshtastic_bridge_info Bridge information')
-            lines.append('# TYPE meshtastic_bridge_info gauge')
-            lines.append('meshtastic_bridge_info{version="2.0"} 1')
-            lines.append('')
-
-            # Uptime
-            lines.append('# HELP meshtastic_bridge_uptime_seconds Bridge uptime in seconds')
-            lines.append('# TYPE meshtastic_bridge_uptime_seconds gauge')
-            lines.append(f'meshtastic_bridge_uptime_seconds {self.get_uptime_seconds():.2f}')
-            lines.append('')
-
-            # Messages received
-            lines.append('# HELP meshtastic_messages_received_total Total messages received per radio')
-            lines.append('# TYPE meshtastic_messages_received_total counter')
-            for radio, count in self.messages_received_total.items():
-                lines.append(f'meshtastic_messages_received_total{{radio="{radio}"}} {count}')
-            lines.append('')
-
-            # Messages sent
-            lines.append('# HELP meshtastic_messages_sent_total Total messages sent per radio')
-            lines.append('# TYPE meshtastic_messages_sent_total counter')
-            for radio, count in self.messages_sent_total.items():
-                lines.append(f'meshtastic_messages_sent_total{{radio="{radio}"}} {count}')
-            lines.append('')
-
-            # Errors
-            lines.append('# HELP meshtastic_messages_errors_total Total message errors per radio')
-            lines.append('# TYPE meshtastic_messages_errors_total counter')
-            for radio, count in self.messages_errors_total.items():
-                lines.append(f'meshtastic_messages_errors_total{{radio="{radio}"}} {count}')
-            lines.append('')
-
-            # Forwarded
-            lines.append('# HELP meshtastic_messages_forwarded_total Total messages forwarded')
-            lines.append('# TYPE meshtastic_messages_forwarded_total counter')
-            lines.append(f'meshtastic_messages_forwarded_total {self.messages_forwarded_total}')
-            lines.append('')
-
-            # Dropped
-            lines.append('# HELP meshtastic_messages_dropped_total Total messages dropped')
-            lines.append('# TYPE meshtastic_messages_dropped_total counter')
-            lines.append(f'meshtastic_messages_dropped_total {self.messages_dropped_total}')
-            lines.append('')
-
-            # Filtered
-            lines.append('# HELP meshtastic_messages_filtered_total Total messages filtered')
-            lines.append('# TYPE meshtastic_messages_filtered_total counter')
-            lines.append(f'meshtastic_messages_filtered_total {self.messages_filtered_total}')
-            lines.append('')
-
-            # Connected radios
-            lines.append('# HELP meshtastic_connected_radios Number of connected radios')
-            lines.append('# TYPE meshtastic_connected_radios gauge')
-            lines.append(f'meshtastic_connected_radios {self.connected_radios}')
-            lines.append('')
-
-            # Active nodes
-            lines.append('# HELP meshtastic_active_nodes Number of active nodes')
-            lines.append('# TYPE meshtastic_active_nodes gauge')
-            lines.append(f'meshtastic_active_nodes {self.active_nodes}')
-            lines.append('')
-
-            # Tracked messages
-            lines.append('# HELP meshtastic_tracked_messages Number of currently tracked messages')
-            lines.append('# TYPE meshtastic_tracked_messages gauge')
-            lines.append(f'meshtastic_tracked_messages {self.tracked_messages}')
-            lines.append('')
-
-            # Processing time statistics
-            if self.message_processing_times:
-                avg_time = sum(self.message_processing_times) / len(self.message_processing_times)
-
-                lines.append('# HELP meshtastic_message_processing_time_ms Message processing time statistics')
-                lines.append('# TYPE meshtastic_message_processing_time_ms gauge')
-                lines.append(f'meshtastic_message_processing_time_ms{{stat="avg"}} {avg_time:.2f}')
-                lines.append(f'meshtastic_message_processing_time_ms{{stat="max"}} {self.max_processing_time:.2f}')
-                lines.append(f'meshtastic_message_processing_time_ms{{stat="min"}} {self.min_processing_time:.2f}')
-                lines.append('')
-
-            # Per-node message counts
-            if self.node_message_counts:
-                lines.append('# HELP meshtastic_node_messages_total Total messages per node')
-                lines.append('# TYPE meshtastic_node_messages_total counter')
-                for node_id, count in self.node_message_counts.items():
-                    # Escape node ID for prometheus label
-                    safe_node_id = node_id.replace('"', '\\"')
-                    lines.append(f'meshtastic_node_messages_total{{node_id="{safe_node_id}"}} {count}')
-                lines.append('')
-
-            return '\n'.join(lines)
+        counters = self.counters.snapshot()
+        node_message_counts = self.node_message_counts.snapshot()
+
+        processing_stats = self._processing_stats()
+
+        text = _PROM_TEMPLATE.format(
+            uptime=self.get_uptime_seconds(),
+            received_radio1=counters.get(('received', 'radio1'), 0),
+            received_radio2=counters.get(('received', 'radio2'), 0),
+            sent_radio1=counters.get(('sent', 'radio1'), 0),
+            sent_radio2=counters.get(('sent', 'radio2'), 0),
+            errors_radio1=counters.get(('errors', 'radio1'), 0),
+            errors_radio2=counters.get(('errors', 'radio2'), 0),
+            forwarded=counters.get('forwarded', 0),
+            dropped=counters.get('dropped', 0),
+            filtered=counters.get('filtered', 0),
+            connected_radios=self.connected_radios,
+            active_nodes=self.active_nodes,
+            tracked_messages=self.tracked_messages
+        )
+
+        # Processing time statistics
+        if processing_stats:
+            avg_time, max_time, min_time = processing_stats
+            text += _PROM_PROCESSING_TEMPLATE.format(avg=avg_time, max=max_time, min=min_time)
+
+        # Per-node message counts (node IDs escaped as prometheus label values)
+        if node_message_counts:
+            text += _PROM_NODE_HEADER + ''.join(
+                _PROM_NODE_LINE % (node_id.translate(_PROM_LABEL_ESCAPE), count)
+                for node_id, count in node_message_counts.items()
+            )
+
+        return text
 
 
 class MetricsHandler(BaseHTTPRequestHandler):
@@ -225,26 +386,38 @@ class MetricsHandler(BaseHTTPRequestHandler):
 
     metrics_collector: Optional[MetricsCollector] = None
 
+    # Keep connections open between scrapes (every response sets Content-Length)
+    protocol_version = 'HTTP/1.1'
+
+    # Drop idle or half-open clients instead of blocking a thread forever
+    timeout = HTTP_IDLE_TIMEOUT
+
     def do_GET(self):
         """Handle GET request"""
         if self.path == '/metrics' and self.metrics_collector:
-            self.send_response(200)
-            self.send_header('Content-Type', 'text/plain; version=0.0.4')
-            self.end_headers()
-
-            metrics = self.metrics_collector.export_prometheus()
-            self.wfile.write(metrics.encode('utf-8'))
+            self._send_body(200, 'text/plain; version=0.0.4',
+                            self.metrics_collector.get_prometheus_payload())
 
         elif self.path == '/health':
-            self.send_response(200)
-            self.send_header('Content-Type', 'text/plain')
-            self.end_headers()
-            self.wfile.write(b'OK')
+            self._send_body(200, 'text/plain', b'OK')
 
         else:
             self.send_response(404)
+            self.send_header('Content-Length', '0')
             self.end_headers()
 
+    def _send_body(self, status: int, content_type: str, body: bytes):
+        """Send a complete response with a known length"""
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_request(self, code='-', size='-'):
+        """Override to skip formatting the access log line"""
+        pass
+
     def log_message(self, format, *args):
         """Override to suppress request logging"""
         pass  # Suppress default logging
@@ -265,7 +438,7 @@ class MetricsServer:
         self.collector = collector
         self.host = host
         self.port = port
-        self.server: Optional[HTTPServer] = None
+        self.server: Optional[ThreadingHTTPServer] = None
         self.thread: Optional[Thread] = None
         self.running = False
 
@@ -275,8 +448,8 @@ class MetricsServer:
             # Set the collector for the handler
             MetricsHandler.metrics_collector = self.collector
 
-            # Create HTTP server
-            self.server = HTTPServer((self.host, self.port), MetricsHandler)
+            # Create HTTP server (one daemon thread per request)
+            self.server = ThreadingHTTPServer((self.host, self.port), MetricsHandler)
             self.running = True
 
             # Start server in background thread
@@ -290,13 +463,12 @@ class MetricsServer:
             raise
 
     def _run_server(self):
-        """Run the HTTP server"""
-        while self.running:
-            try:
-                self.server.handle_request()
-            except Exception as e:
-                if self.running:  # Only log if we're supposed to be running
-                    logger.error(f"Error handling metrics request: {e}")
+        """Run the HTTP server until stop() is called"""
+        try:
+            self.server.serve_forever(poll_interval=0.5)
+        except Exception as e:
+            if self.running:  # Only log if we're supposed to be running
+                logger.error(f"Error running metrics server: {e}")
 
     def stop(self):
         """Stop the metrics server"""
@@ -305,6 +477,7 @@ class MetricsServer:
         if self.server:
             try:
                 self.server.shutdown()
+                self.server.server_close()
                 logger.info("Metrics server stopped")
             except Exception as e:
                 logger.error(f"Error stopping metrics server: {e}")
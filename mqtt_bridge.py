@@ -7,8 +7,9 @@ Publishes messages to MQTT and subscribes to topics for sending
 import json
 import logging
 import time
+from datetime import datetime
 from typing import Dict, Any, Optional, Callable
-from threading import Thread
+from threading import Thread, Event
 
 try:
     import paho.mqtt.client as mqtt
@@ -16,9 +17,36 @@ try:
 except ImportError:
     MQTT_AVAILABLE = False
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 
+def _json_default(obj):
+    """Serialize values the JSON encoder doesn't handle natively"""
+    if hasattr(obj, 'isoformat'):
+        return obj.isoformat()
+    return str(obj)
+
+
+def _json_dumps(data: Any) -> bytes:
+    """Encode data as a UTF-8 JSON payload"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, default=_json_default)
+    return json.dumps(data, default=_json_default).encode('utf-8')
+
+
+def _json_loads(payload):
+    """Decode a JSON payload (raises json.JSONDecodeError on invalid input)"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(payload)
+    return json.loads(payload)
+
+
 class MQTTBridge:
     """MQTT integration for Meshtastic Bridge"""
 
@@ -46,10 +74,24 @@ class MQTTBridge:
         self.publish_outgoing = config.get('publish_outgoing', True)
         self.qos = config.get('qos', 1)
         self.retain = config.get('retain', False)
+        self.publish_text = config.get('publish_text', True)
+        self.publish_channel_topic = config.get('publish_channel_topic', True)
+        # QoS for the text/ and channel/ copies; 0 skips paho's in-flight tracking
+        self.secondary_qos = config.get('secondary_qos', self.qos)
+        # 'iso' (ISO 8601 string) or 'epoch_ms' (milliseconds since the epoch)
+        self.timestamp_format = config.get('timestamp_format', 'iso')
+
+        # Per-direction topic prefixes, built once: direction -> (data, text, channel suffix)
+        self._message_topics: Dict[str, tuple] = {}
 
         # Client ID
         self.client_id = config.get('client_id', 'meshtastic-bridge')
 
+        if not (self.publish_text or self.publish_channel_topic):
+            logger.info("MQTT text and channel topics disabled; publishing messages/ topics only")
+        if config.get('homeassistant_discovery', False) and not self.publish_text:
+            logger.warning("Home Assistant sensors read the text/ topics, which publish_text disables")
+
         # Create MQTT client
         self.client = mqtt.Client(client_id=self.client_id)
 
@@ -65,6 +107,11 @@ class MQTTBridge:
         # Connection state
         self.connected = False
         self.running = False
+        self._connected_event = Event()
+
+        # Nodes whose Home Assistant discovery config was already published
+        # (it is retained, so once per node and connection is enough)
+        self._ha_discovery_sent = set()
 
         # Statistics
         self.stats = {
@@ -83,13 +130,8 @@ class MQTTBridge:
             self.client.loop_start()
             self.running = True
 
-            # Wait for connection
-            timeout = 10
-            start = time.time()
-            while not self.connected and (time.time() - start) < timeout:
-                time.sleep(0.1)
-
-            if not self.connected:
+            # Wait for connection (set by _on_connect)
+            if not self._connected_event.wait(timeout=10):
                 raise TimeoutError("Connection timeout")
 
             logger.info("Connected to MQTT broker")
@@ -102,8 +144,12 @@ class MQTTBridge:
         """Called when connected to MQTT broker"""
         if rc == 0:
             self.connected = True
+            self._connected_event.set()
             logger.info("MQTT connection successful")
 
+            # Announce nodes again in case the broker lost retained messages
+            self._ha_discovery_sent.clear()
+
             # Subscribe to command topics
             command_topic = f"{self.topic_prefix}/command/#"
             self.client.subscribe(command_topic, qos=self.qos)
@@ -119,6 +165,7 @@ class MQTTBridge:
     def _on_disconnect(self, client, userdata, rc):
         """Called when disconnected from MQTT broker"""
         self.connected = False
+        self._connected_event.clear()
         if rc != 0:
             logger.warning(f"Unexpected MQTT disconnection (code {rc})")
         else:
@@ -128,9 +175,10 @@ class MQTTBridge:
         """Called when a message is received from MQTT"""
         try:
             topic = message.topic
-            payload = message.payload.decode('utf-8')
+            # Keep the raw bytes; the JSON decoder parses them directly
+            payload = message.payload
 
-            logger.debug(f"MQTT message received on {topic}: {payload}")
+            logger.debug("MQTT message received on %s: %r", topic, payload)
             self.stats['received'] += 1
 
             # Handle command messages
@@ -141,7 +189,7 @@ class MQTTBridge:
             logger.error(f"Error handling MQTT message: {e}")
             self.stats['errors'] += 1
 
-    def _handle_command(self, topic: str, payload: str):
+    def _handle_command(self, topic: str, payload: bytes):
         """Handle command messages from MQTT"""
         try:
             # Extract command from topic
@@ -154,8 +202,8 @@ class MQTTBridge:
             if command == 'send' and self.message_callback:
                 # Parse send command
                 try:
-                    data = json.loads(payload)
-                    text = data.get('text', payload)
+                    data = _json_loads(payload)
+                    text = data.get('text', payload.decode('utf-8', errors='replace'))
                     radio = data.get('radio', 'radio1')
                     channel = data.get('channel', 0)
 
@@ -163,10 +211,11 @@ class MQTTBridge:
                     self.message_callback(text, radio, channel)
                     logger.info(f"Sent message from MQTT: {text}")
 
-                except json.JSONDecodeError:
+                except (json.JSONDecodeError, UnicodeDecodeError):
                     # If not JSON, treat as plain text
-                    self.message_callback(payload, 'radio1', 0)
-                    logger.info(f"Sent message from MQTT: {payload}")
+                    text = payload.decode('utf-8', errors='replace')
+                    self.message_callback(text, 'radio1', 0)
+                    logger.info(f"Sent message from MQTT: {text}")
 
         except Exception as e:
             logger.error(f"Error handling MQTT command: {e}")
@@ -180,44 +229,51 @@ class MQTTBridge:
             message: Message dictionary
             direction: 'incoming' or 'outgoing'
         """
+        # Check if we should publish this direction
+        if direction == 'incoming' and not self.publish_incoming:
+            return
+        if direction == 'outgoing' and not self.publish_outgoing:
+            return
+
         if not self.connected:
             logger.warning("Not connected to MQTT broker")
             return
 
         try:
-            # Check if we should publish this direction
-            if direction == 'incoming' and not self.publish_incoming:
-                return
-            if direction == 'outgoing' and not self.publish_outgoing:
-                return
-
             # Build topic
             from_node = message.get('from', 'unknown')
             channel = message.get('channel', 0)
+            data_prefix, text_prefix, channel_suffix = self._get_message_topics(direction)
+
+            timestamp = message.get('timestamp')
+            if self.timestamp_format == 'epoch_ms' and isinstance(timestamp, datetime):
+                timestamp = int(timestamp.timestamp() * 1000)
 
             # Publish to multiple topics for flexibility
 
-            # 1. Full message data (JSON)
-            data_topic = f"{self.topic_prefix}/messages/{direction}/{from_node}"
-            payload = json.dumps({
+            # 1. Full message data (JSON, encoded once and reused below)
+            data_topic = f"{data_prefix}{from_node}"
+            payload = _json_dumps({
                 'id': message.get('id'),
                 'from': from_node,
                 'to': message.get('to'),
                 'text': message.get('text'),
                 'channel': channel,
-                'timestamp': message.get('timestamp').isoformat() if message.get('timestamp') else None,
+                'timestamp': timestamp,
                 'forwarded': message.get('forwarded', False)
             })
             self.client.publish(data_topic, payload, qos=self.qos, retain=self.retain)
 
             # 2. Text content only
-            text_topic = f"{self.topic_prefix}/text/{direction}/{from_node}"
-            text = message.get('text', '')
-            self.client.publish(text_topic, text, qos=self.qos, retain=False)
+            if self.publish_text:
+                text_topic = f"{text_prefix}{from_node}"
+                text = message.get('text', '')
+                self.client.publish(text_topic, text, qos=self.secondary_qos, retain=False)
 
             # 3. Channel-based topic
-            channel_topic = f"{self.topic_prefix}/channel/{channel}/{direction}"
-            self.client.publish(channel_topic, payload, qos=self.qos, retain=False)
+            if self.publish_channel_topic:
+                channel_topic = f"{self.topic_prefix}/channel/{channel}{channel_suffix}"
+                self.client.publish(channel_topic, payload, qos=self.secondary_qos, retain=False)
 
             # 4. Home Assistant discovery (if configured)
             if self.config.get('homeassistant_discovery', False):
@@ -230,8 +286,28 @@ class MQTTBridge:
             logger.error(f"Failed to publish to MQTT: {e}")
             self.stats['errors'] += 1
 
+    def _get_message_topics(self, direction: str) -> tuple:
+        """
+        Get the topic prefixes used by publish_message for a direction
+
+        Returns:
+            Tuple of (data topic prefix, text topic prefix, channel topic suffix)
+        """
+        topics = self._message_topics.get(direction)
+        if topics is None:
+            topics = (
+                f"{self.topic_prefix}/messages/{direction}/",
+                f"{self.topic_prefix}/text/{direction}/",
+                f"/{direction}"
+            )
+            self._message_topics[direction] = topics
+        return topics
+
     def _publish_homeassistant_discovery(self, node_id: str):
-        """Publish Home Assistant MQTT discovery message"""
+        """Publish Home Assistant MQTT discovery message (once per node)"""
+        if node_id in self._ha_discovery_sent:
+            return
+
         try:
             # Create sensor for this node
             discovery_topic = f"homeassistant/sensor/meshtastic_{node_id}/config"
@@ -249,7 +325,8 @@ class MQTTBridge:
                 }
             }
 
-            self.client.publish(discovery_topic, json.dumps(config), qos=1, retain=True)
+            self.client.publish(discovery_topic, _json_dumps(config), qos=1, retain=True)
+            self._ha_discovery_sent.add(node_id)
 
         except Exception as e:
             logger.error(f"Failed to publish Home Assistant discovery: {e}")
@@ -261,7 +338,7 @@ class MQTTBridge:
 
         try:
             status_topic = f"{self.topic_prefix}/bridge/status"
-            payload = json.dumps(status)
+            payload = _json_dumps(status)
             self.client.publish(status_topic, payload, qos=1, retain=True)
 
         except Exception as e:
@@ -274,7 +351,7 @@ class MQTTBridge:
 
         try:
             stats_topic = f"{self.topic_prefix}/bridge/statistics"
-            payload = json.dumps(stats)
+            payload = _json_dumps(stats)
             self.client.publish(stats_topic, payload, qos=1, retain=False)
 
         except Exception as e:
@@ -332,7 +409,6 @@ def main():
 
         # Publish a test message
         print("\nPublishing test message...")
-        from datetime import datetime
         test_message = {
             'id': 'test123',
             'from': '!abc123456',
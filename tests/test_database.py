@@ -0,0 +1,90 @@
+"""Tests for the SQLite storage layer"""
+
+import os
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from database import DatabaseManager  # noqa: E402
+
+
+def _row(msg_id, from_node, text, timestamp):
+    return (msg_id, from_node, '^all', text, 0, timestamp, False, 'radio1', None)
+
+
+@pytest.fixture
+def db(tmp_path):
+    manager = DatabaseManager(db_path=str(tmp_path / 'test.db'), retention_days=30)
+    yield manager
+    manager.close()
+
+
+def _node_counts(db):
+    return {node['node_id']: node['message_count'] for node in db.get_nodes(active_hours=24)}
+
+
+def test_duplicates_not_counted(db):
+    now = datetime.now()
+    assert db.write_batch([_row('1', '!a', 'one', now), _row('2', '!b', 'two', now)], [])
+
+    # '1' is a duplicate (same msg_id and timestamp); only '3' is new
+    assert db.write_batch([_row('1', '!a', 'one', now), _row('3', '!b', 'three', now)], [])
+
+    assert _node_counts(db) == {'!a': 1, '!b': 2}
+    stats = db.get_summary_stats()
+    assert stats['total_messages'] == 3
+    assert stats['messages_today'] == 3
+
+
+def test_bulk_import_skips_duplicates(db):
+    now = datetime.now()
+    rows = [_row(str(i), '!n%d' % (i % 2), 'msg %d' % i, now) for i in range(10)]
+    assert db.bulk_import(rows) == 10
+    assert db.bulk_import(rows + [_row('10', '!n0', 'msg 10', now)]) == 1
+
+    assert _node_counts(db) == {'!n0': 6, '!n1': 5}
+    assert db.get_summary_stats()['messages_today'] == 11
+
+
+def test_add_message_returns_existing_id_for_duplicate(db):
+    now = datetime.now()
+    first = db.add_message('1', '!a', '^all', 'hello', 0, now)
+    assert first > 0
+    assert db.add_message('1', '!a', '^all', 'hello', 0, now) == first
+    assert _node_counts(db) == {'!a': 1}
+
+
+def test_search_matches_word_prefixes(db):
+    if not db._fts_enabled:
+        pytest.skip('SQLite built without FTS5')
+
+    now = datetime.now()
+    db.write_batch([
+        _row('1', '!a', 'Hello world', now),
+        _row('2', '!a', 'help wanted', now + timedelta(seconds=1)),
+        _row('3', '!a', 'shell "quoted"', now + timedelta(seconds=2)),
+    ], [])
+
+    assert [m['msg_id'] for m in db.search_messages('hel')] == ['2', '1']
+    assert [m['msg_id'] for m in db.search_messages('hel wor')] == ['1']
+    assert db.search_messages('ell') == []
+    # FTS syntax in the input is matched literally rather than raising
+    assert [m['msg_id'] for m in db.search_messages('"quoted')] == ['3']
+
+
+def test_cleanup_keeps_counters_consistent(db):
+    now = datetime.now()
+    old = now - timedelta(days=60)
+    db.write_batch([_row('old%d' % i, '!a', 'old message', old) for i in range(5)] +
+                   [_row('new%d' % i, '!a', 'new message', now) for i in range(3)], [])
+
+    assert db.cleanup_old_messages() == 5
+
+    stats = db.get_summary_stats()
+    assert stats['total_messages'] == 3
+    assert stats['messages_today'] == 3
+    # The search index drops the deleted rows along with the table
+    assert len(db.search_messages('message')) == 3
@@ -0,0 +1,63 @@
+"""Tests for the web interface's conditional JSON responses"""
+
+import os
+import sys
+from datetime import datetime
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+pytest.importorskip('flask')
+pytest.importorskip('flask_socketio')
+pytest.importorskip('flask_compress')
+
+import web_interface  # noqa: E402
+
+
+class FakeBridge:
+    """Minimal stand-in for the bridge with enough messages to compress"""
+
+    def __init__(self):
+        self.running = True
+        self.interface1 = None
+        self.interface2 = None
+        self.messages = [
+            {'id': i, 'from': '!abc%d' % i, 'text': 'message %d' % i,
+             'timestamp': datetime(2024, 1, 1, 12, 0, i), 'forwarded': False}
+            for i in range(20)
+        ]
+
+    def get_stats(self):
+        return {}
+
+    def get_recent_messages(self, count):
+        return self.messages[-count:]
+
+
+@pytest.fixture
+def client():
+    web = web_interface.WebInterface(FakeBridge(), {'port': 0})
+    # Older Flask-Compress releases never re-check the rewritten tag, so
+    # the 304 has to come from the route itself
+    web.app.config['COMPRESS_EVALUATE_CONDITIONAL_REQUEST'] = False
+    return web.app.test_client()
+
+
+def test_gzip_etag_revalidates(client):
+    headers = {'Accept-Encoding': 'gzip'}
+    first = client.get('/api/messages', headers=headers)
+    assert first.status_code == 200
+    assert first.headers['Content-Encoding'] == 'gzip'
+    assert first.headers['ETag'].endswith(':gzip"')
+
+    second = client.get('/api/messages', headers={
+        **headers, 'If-None-Match': first.headers['ETag']})
+    assert second.status_code == 304
+
+
+def test_plain_etag_revalidates(client):
+    first = client.get('/api/messages')
+    assert first.status_code == 200
+    second = client.get('/api/messages', headers={'If-None-Match': first.headers['ETag']})
+    assert second.status_code == 304
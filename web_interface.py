@@ -4,18 +4,160 @@ Web Interface for Meshtastic Bridge
 Provides REST API and real-time web dashboard
 """
 
+import gzip
 import json
 import logging
+import mimetypes
+import os
+import time
+import zlib
+from collections import deque
 from datetime import datetime
 from typing import Dict, Any, Optional
-from threading import Thread
+from threading import Thread, Event
 
-from flask import Flask, render_template, jsonify, request, send_from_directory
+from flask import Flask, Response, abort, render_template, request, send_from_directory
 from flask_cors import CORS
 from flask_socketio import SocketIO, emit
+from werkzeug.security import safe_join
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    from flask_compress import Compress
+    COMPRESS_AVAILABLE = True
+except ImportError:
+    COMPRESS_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# Seconds to collect new messages before pushing them to clients in one event
+BROADCAST_BATCH_DELAY = 0.05
+
+# Number of broadcast messages kept ready to serve from /api/messages
+MESSAGE_BUFFER_SIZE = 500
+
+# Largest ?count= accepted by /api/messages
+MAX_MESSAGE_COUNT = 500
+
+# Seconds a status timestamp is reused across requests
+STATUS_TIMESTAMP_TTL = 0.1
+
+# /api/status body; only the values change between requests
+_STATUS_TEMPLATE = (
+    b'{"status":"%s","radios":{"radio1":{"connected":%s,"port":%s},'
+    b'"radio2":{"connected":%s,"port":%s}},"timestamp":"%s"}'
+)
+
+# Seconds an encoded /api/statistics body is served to every client
+STATS_CACHE_TTL = 1.0
+
+# Seconds between checks for changed statistics to push to clients
+STATS_PUSH_INTERVAL = 5.0
+
+# Version of the files written by create_web_files(). Bump it whenever the
+# generated dashboard changes in a way the server depends on (events,
+# transports), so existing installs regenerate their copies
+WEB_FILES_VERSION = '2'
+WEB_VERSION_FILE = 'web/.version'
+
+# Seconds browsers may reuse static dashboard files without revalidating;
+# index.html tags their URLs with WEB_FILES_VERSION to bust the cache
+STATIC_MAX_AGE = 86400
+
+
+def _json_default(obj):
+    """Serialize values the JSON encoder doesn't handle natively"""
+    if hasattr(obj, 'isoformat'):
+        return obj.isoformat()
+    return str(obj)
+
+
+def _json_dumps(data: Any) -> bytes:
+    """Encode data as compact UTF-8 JSON (datetimes become ISO 8601 strings)"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, default=_json_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, default=_json_default, separators=(',', ':')).encode('utf-8')
+
+
+def _json_response(data: Any, status: int = 200) -> Response:
+    """Build a JSON response, encoded with orjson when available"""
+    return Response(_json_dumps(data), status=status, mimetype='application/json')
+
+
+def _message_view(message: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Map a tracker entry or a database row to the /api/messages schema
+
+    Args:
+        message: Tracker/broadcast entry ('from', 'to', ...) or database
+            row ('from_node', 'to_node', 'msg_id', ...)
+
+    Returns:
+        New dict with id, from, to, text, channel, ISO timestamp and forwarded
+    """
+    if 'from_node' in message:
+        msg_id = message.get('msg_id')
+        message = {
+            'id': int(msg_id) if isinstance(msg_id, str) and msg_id.isdigit() else msg_id,
+            'from': message['from_node'],
+            'to': message.get('to_node'),
+            'text': message.get('text'),
+            'channel': message.get('channel'),
+            'timestamp': message.get('timestamp'),
+            'forwarded': bool(message.get('forwarded'))
+        }
+    else:
+        message = dict(message)
+
+    timestamp = message.get('timestamp')
+    if isinstance(timestamp, str):
+        try:
+            timestamp = datetime.fromisoformat(timestamp)
+        except ValueError:
+            pass
+    if isinstance(timestamp, datetime):
+        message['timestamp'] = timestamp.isoformat()
+    return message
+
+
+class _OrjsonCodec:
+    """json-module stand-in that makes Socket.IO encode packets with orjson"""
+
+    @staticmethod
+    def dumps(obj: Any, **kwargs) -> str:
+        return _json_dumps(obj).decode('utf-8')
+
+    @staticmethod
+    def loads(data, **kwargs) -> Any:
+        return orjson.loads(data)
+
+
+def _etag_response(body: bytes) -> Response:
+    """
+    Build a JSON response tagged with a checksum of its body
+
+    Args:
+        body: Encoded JSON body
+
+    Returns:
+        Empty 304 response if the client already holds this body, else a 200
+    """
+    etag = format(zlib.crc32(body), '08x')
+    # Flask-Compress rewrites the tag to "<etag>:gzip" / "<etag>:br" on
+    # compressed responses, so clients echo those forms back
+    if any(request.if_none_match.contains(tag)
+           for tag in (etag, etag + ':gzip', etag + ':br')):
+        response = Response(status=304)
+    else:
+        response = Response(body, mimetype='application/json')
+    response.set_etag(etag)
+    return response
+
 
 class WebInterface:
     """Web interface for monitoring and controlling the bridge"""
@@ -36,12 +178,32 @@ class WebInterface:
                         static_folder='web/static',
                         template_folder='web/templates')
         self.app.config['SECRET_KEY'] = config.get('secret_key', 'meshtastic-bridge-secret')
+        self.app.config['SEND_FILE_MAX_AGE_DEFAULT'] = STATIC_MAX_AGE
+
+        # Anything still going through Flask's JSON provider stays compact and
+        # unsorted, even in debug mode
+        self.app.json.compact = True
+        self.app.json.sort_keys = False
 
         # Enable CORS
         CORS(self.app)
 
-        # SocketIO for real-time updates
-        self.socketio = SocketIO(self.app, cors_allowed_origins="*")
+        # Compress API responses for clients that accept it (cheap levels,
+        # bodies under Flask-Compress' minimum size are sent as they are)
+        if COMPRESS_AVAILABLE:
+            self.app.config['COMPRESS_MIMETYPES'] = ['application/json']
+            self.app.config['COMPRESS_LEVEL'] = 4
+            self.app.config['COMPRESS_BR_LEVEL'] = 4
+            Compress(self.app)
+
+        # SocketIO for real-time updates. The rest of the bridge uses plain
+        # threads (serial I/O, pubsub), so stay on the threading server rather
+        # than letting an installed eventlet/gevent take over unpatched.
+        # Clients connect straight over WebSocket, without the long-polling
+        # handshake and upgrade
+        socketio_options = {'json': _OrjsonCodec} if ORJSON_AVAILABLE else {}
+        self.socketio = SocketIO(self.app, cors_allowed_origins="*", async_mode='threading',
+                                 transports=['websocket'], **socketio_options)
 
         # Setup routes
         self._setup_routes()
@@ -56,59 +218,139 @@ class WebInterface:
         self.server_thread: Optional[Thread] = None
         self.running = False
 
+        # Messages waiting to be pushed to clients as one 'new_message_batch'
+        self._pending_messages = deque()
+        self._pending_event = Event()
+
+        # Newest broadcast messages, already normalized for JSON
+        self._recent_messages = deque(maxlen=MESSAGE_BUFFER_SIZE)
+
+        # (monotonic time, encoded ISO string) of the last status timestamp
+        self._ts_cache = (0.0, b'')
+
+        # ((port1, port2), encoded port1, encoded port2) for /api/status
+        self._status_ports = (None, b'null', b'null')
+
+        # (monotonic time, encoded body) of the last /api/statistics response
+        self._stats_cache = (0.0, b'')
+
+    def _status_timestamp(self) -> bytes:
+        """Current time as ISO 8601 bytes, shared by requests within STATUS_TIMESTAMP_TTL"""
+        now = time.monotonic()
+        cached_at, timestamp = self._ts_cache
+        if now - cached_at > STATUS_TIMESTAMP_TTL:
+            timestamp = datetime.now().isoformat().encode('ascii')
+            self._ts_cache = (now, timestamp)
+        return timestamp
+
+    def _status_body(self) -> bytes:
+        """Fill the /api/status template from the bridge's current state"""
+        bridge = self.bridge
+        ports = (bridge.port1, bridge.port2)
+        cached = self._status_ports
+        if cached[0] != ports:
+            # Ports only change on (re)connect, so encode them once per change
+            cached = (ports, _json_dumps(ports[0]), _json_dumps(ports[1]))
+            self._status_ports = cached
+
+        return _STATUS_TEMPLATE % (
+            b'running' if bridge.running else b'stopped',
+            b'false' if bridge.interface1 is None else b'true',
+            cached[1],
+            b'false' if bridge.interface2 is None else b'true',
+            cached[2],
+            self._status_timestamp()
+        )
+
+    def _stats_body(self) -> bytes:
+        """Encoded bridge statistics, reused for STATS_CACHE_TTL"""
+        now = time.monotonic()
+        cached_at, body = self._stats_cache
+        if now - cached_at > STATS_CACHE_TTL:
+            body = _json_dumps(self.bridge.get_stats())
+            self._stats_cache = (now, body)
+        return body
+
     def _setup_routes(self):
         """Setup Flask routes"""
 
+        @self.app.endpoint('static')
+        def static(filename):
+            """Serve static files, using the pre-gzipped copy when accepted"""
+            static_folder = self.app.static_folder
+            path = safe_join(static_folder, filename)
+            if path is None:
+                abort(404)
+
+            # Skip a .gz copy older than its source; it would serve stale content
+            gz_path = path + '.gz'
+            if request.accept_encodings['gzip'] and os.path.isfile(path) and \
+                    os.path.isfile(gz_path) and \
+                    os.path.getmtime(gz_path) >= os.path.getmtime(path):
+                mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+                response = send_from_directory(static_folder, filename + '.gz', mimetype=mimetype)
+                response.headers['Content-Encoding'] = 'gzip'
+            else:
+                response = send_from_directory(static_folder, filename)
+            response.vary.add('Accept-Encoding')
+            return response
+
         @self.app.route('/')
         def index():
             """Serve main dashboard"""
-            return render_template('index.html')
+            return render_template('index.html', web_files_version=WEB_FILES_VERSION)
 
         @self.app.route('/api/status')
         def api_status():
             """Get bridge status"""
             try:
-                return jsonify({
-                    'status': 'running' if self.bridge.running else 'stopped',
-                    'radios': {
-                        'radio1': {
-                            'connected': self.bridge.interface1 is not None,
-                            'port': self.bridge.port1
-                        },
-                        'radio2': {
-                            'connected': self.bridge.interface2 is not None,
-                            'port': self.bridge.port2
-                        }
-                    },
-                    'timestamp': datetime.now().isoformat()
-                })
+                return Response(self._status_body(), mimetype='application/json')
             except Exception as e:
-                return jsonify({'error': str(e)}), 500
+                return _json_response({'error': str(e)}, 500)
 
         @self.app.route('/api/statistics')
         def api_statistics():
             """Get bridge statistics"""
             try:
-                stats = self.bridge.get_stats()
-                return jsonify(stats)
+                return _etag_response(self._stats_body())
             except Exception as e:
-                return jsonify({'error': str(e)}), 500
+                return _json_response({'error': str(e)}, 500)
+
+        @self.app.route('/api/state')
+        def api_state():
+            """Get bridge status and statistics in one response"""
+            try:
+                body = b'{"status":%s,"stats":%s}' % (self._status_body(), self._stats_body())
+                return Response(body, mimetype='application/json')
+            except Exception as e:
+                return _json_response({'error': str(e)}, 500)
 
         @self.app.route('/api/messages')
         def api_messages():
             """Get recent messages"""
             try:
-                count = request.args.get('count', 50, type=int)
-                messages = self.bridge.get_recent_messages(count)
-
-                # Convert datetime objects to ISO format
-                for msg in messages:
-                    if 'timestamp' in msg and hasattr(msg['timestamp'], 'isoformat'):
-                        msg['timestamp'] = msg['timestamp'].isoformat()
-
-                return jsonify(messages)
+                try:
+                    count = min(int(request.args.get('count', '50')), MAX_MESSAGE_COUNT)
+                except ValueError:
+                    count = 50
+                if count <= 0:
+                    return _etag_response(b'[]')
+
+                # Serve from the broadcast buffer once it holds enough messages.
+                # Either way the response is newest first, in the buffer's schema
+                recent = self._recent_messages
+                if count <= len(recent):
+                    messages = list(recent)[-count:]
+                    messages.reverse()
+                    return _etag_response(_json_dumps(messages))
+
+                # The tracker returns oldest first and the database newest
+                # first, with different keys; normalize both (on copies)
+                messages = [_message_view(msg) for msg in self.bridge.get_recent_messages(count)]
+                messages.sort(key=lambda msg: str(msg.get('timestamp') or ''), reverse=True)
+                return _etag_response(_json_dumps(messages))
             except Exception as e:
-                return jsonify({'error': str(e)}), 500
+                return _json_response({'error': str(e)}, 500)
 
         @self.app.route('/api/send', methods=['POST'])
         def api_send():
@@ -117,7 +359,7 @@ class WebInterface:
                 data = request.get_json()
 
                 if not data or 'text' not in data:
-                    return jsonify({'error': 'Missing text field'}), 400
+                    return _json_response({'error': 'Missing text field'}, 400)
 
                 text = data['text']
                 radio = data.get('radio', 'radio1')
@@ -126,12 +368,12 @@ class WebInterface:
                 success = self.bridge.send_message(text, radio, channel)
 
                 if success:
-                    return jsonify({'success': True, 'message': 'Message sent'})
+                    return _json_response({'success': True, 'message': 'Message sent'})
                 else:
-                    return jsonify({'error': 'Failed to send message'}), 500
+                    return _json_response({'error': 'Failed to send message'}, 500)
 
             except Exception as e:
-                return jsonify({'error': str(e)}), 500
+                return _json_response({'error': str(e)}, 500)
 
         @self.app.route('/api/nodes')
         def api_nodes():
@@ -148,26 +390,26 @@ class WebInterface:
                             'info': str(info)
                         })
 
-                return jsonify(nodes)
+                return _json_response(nodes)
             except Exception as e:
-                return jsonify({'error': str(e)}), 500
+                return _json_response({'error': str(e)}, 500)
 
         @self.app.route('/api/settings', methods=['GET', 'POST'])
         def api_settings():
             """Get or update settings"""
             try:
                 if request.method == 'GET':
-                    return jsonify(self.bridge.radio_settings)
+                    return _json_response(self.bridge.radio_settings)
                 else:
                     # Update settings (if needed)
-                    return jsonify({'message': 'Settings update not implemented'})
+                    return _json_response({'message': 'Settings update not implemented'})
             except Exception as e:
-                return jsonify({'error': str(e)}), 500
+                return _json_response({'error': str(e)}, 500)
 
         @self.app.route('/health')
         def health():
             """Health check endpoint"""
-            return jsonify({'status': 'healthy'})
+            return _json_response({'status': 'healthy'})
 
     def _setup_socketio(self):
         """Setup SocketIO event handlers"""
@@ -196,20 +438,62 @@ class WebInterface:
                 logger.error(f"Error handling status request: {e}")
 
     def broadcast_message(self, message: Dict[str, Any]):
-        """Broadcast a new message to all connected clients"""
+        """Queue a new message for the next broadcast to all connected clients"""
         try:
-            # Convert datetime to ISO format
-            if 'timestamp' in message and hasattr(message['timestamp'], 'isoformat'):
-                message = message.copy()
-                message['timestamp'] = message['timestamp'].isoformat()
-
-            self.socketio.emit('new_message', message)
+            # String timestamps are sent as they are; datetimes are converted
+            # to ISO format on a copy so the caller's dict is left alone
+            timestamp = message.get('timestamp')
+            if isinstance(timestamp, datetime):
+                message = {**message, 'timestamp': timestamp.isoformat()}
+
+            self._recent_messages.append(message)
+            self._pending_messages.append(message)
+            self._pending_event.set()
         except Exception as e:
             logger.error(f"Error broadcasting message: {e}")
 
+    def _flush_messages(self):
+        """Push queued messages to clients, coalescing bursts into one event"""
+        while True:
+            self._pending_event.wait()
+            if not self.running:
+                return
+            self._pending_event.clear()
+
+            # Give a burst a moment to arrive, then send it all at once
+            self.socketio.sleep(BROADCAST_BATCH_DELAY)
+            batch = []
+            while self._pending_messages:
+                batch.append(self._pending_messages.popleft())
+
+            if batch:
+                try:
+                    self.socketio.emit('new_message_batch', batch)
+                except Exception as e:
+                    logger.error(f"Error broadcasting messages: {e}")
+
+    def _push_statistics(self):
+        """Push statistics to clients whenever they have changed"""
+        last_pushed = None
+        while True:
+            self.socketio.sleep(STATS_PUSH_INTERVAL)
+            if not self.running:
+                return
+
+            try:
+                stats = self.bridge.get_stats()
+                body = _json_dumps(stats)
+                if body != last_pushed:
+                    last_pushed = body
+                    self.broadcast_statistics(stats)
+                    self._stats_cache = (time.monotonic(), body)
+            except Exception as e:
+                logger.error(f"Error pushing statistics: {e}")
+
     def broadcast_statistics(self, stats: Dict[str, Any]):
         """Broadcast statistics update to all connected clients"""
         try:
+            self._stats_cache = (0.0, b'')  # Don't serve stats older than the push
             self.socketio.emit('statistics_update', stats)
         except Exception as e:
             logger.error(f"Error broadcasting statistics: {e}")
@@ -223,6 +507,10 @@ class WebInterface:
             self.server_thread = Thread(target=self._run_server, daemon=True)
             self.server_thread.start()
 
+            # Start the message and statistics broadcasters
+            self.socketio.start_background_task(self._flush_messages)
+            self.socketio.start_background_task(self._push_statistics)
+
             logger.info(f"Web interface started on http://{self.host}:{self.port}")
 
         except Exception as e:
@@ -238,7 +526,11 @@ class WebInterface:
                 port=self.port,
                 debug=self.debug,
                 use_reloader=False,
-                log_output=not self.debug
+                log_output=not self.debug,
+                # Runs as a service without a TTY; with simple-websocket
+                # installed each client holds one WebSocket instead of
+                # repeatedly long-polling
+                allow_unsafe_werkzeug=True
             )
         except Exception as e:
             if self.running:
@@ -247,14 +539,27 @@ class WebInterface:
     def stop(self):
         """Stop the web server"""
         self.running = False
+        self._pending_event.set()  # Wake the broadcaster so it exits
         # SocketIO will handle cleanup
         logger.info("Web interface stopped")
 
 
+def web_files_current() -> bool:
+    """
+    Check whether the generated web files match this version of the server
+
+    Returns:
+        True if the files exist and carry the current version stamp
+    """
+    try:
+        with open(WEB_VERSION_FILE) as f:
+            return f.read().strip() == WEB_FILES_VERSION
+    except OSError:
+        return False
+
+
 def create_web_files():
     """Create HTML and JavaScript files for the web interface"""
-    import os
-
     # Create directories
     os.makedirs('web/templates', exist_ok=True)
     os.makedirs('web/static/css', exist_ok=True)
@@ -267,7 +572,7 @@ def create_web_files():
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Meshtastic Bridge - Dashboard</title>
-    <link rel="stylesheet" href="/static/css/style.css">
+    <link rel="stylesheet" href="/static/css/style.css?v={{ web_files_version }}">
     <script src="https://cdn.socket.io/4.5.4/socket.io.min.js"></script>
 </head>
 <body>
@@ -327,7 +632,7 @@ def create_web_files():
         </div>
     </div>
 
-    <script src="/static/js/app.js"></script>
+    <script src="/static/js/app.js?v={{ web_files_version }}"></script>
 </body>
 </html>'''
 
@@ -529,7 +834,7 @@ h2 {
 
     # Create JavaScript
     js_content = '''// Initialize Socket.IO
-const socket = io();
+const socket = io({transports: ['websocket'], upgrade: false});
 
 // DOM elements
 const statusEl = document.getElementById('status');
@@ -539,13 +844,15 @@ const messageInput = document.getElementById('messageInput');
 const radioSelect = document.getElementById('radioSelect');
 const sendButton = document.getElementById('sendButton');
 
+// One formatter for all message times (same output as toLocaleTimeString())
+const timeFormat = new Intl.DateTimeFormat(undefined, {timeStyle: 'medium'});
+
 // Connection status
 socket.on('connect', () => {
     console.log('Connected to server');
     updateStatus('connected');
     loadMessages();
-    loadStatistics();
-    startAutoRefresh();
+    loadState();
 });
 
 socket.on('disconnect', () => {
@@ -553,9 +860,9 @@ socket.on('disconnect', () => {
     updateStatus('disconnected');
 });
 
-// Real-time message updates
-socket.on('new_message', (message) => {
-    addMessage(message);
+// Real-time message updates (bursts arrive together)
+socket.on('new_message_batch', (messages) => {
+    addMessages(messages);
 });
 
 // Statistics updates
@@ -584,7 +891,7 @@ async function loadMessages() {
         if (messages.length === 0) {
             messagesEl.innerHTML = '<p class="empty-message">No messages yet...</p>';
         } else {
-            messages.reverse().forEach(msg => addMessage(msg));
+            addMessages(messages.reverse());
         }
     } catch (error) {
         console.error('Error loading messages:', error);
@@ -592,44 +899,57 @@ async function loadMessages() {
 }
 
 // Add a message to the display
-function addMessage(message) {
+function addMessages(messages) {
     // Remove empty message if present
     const emptyMsg = messagesEl.querySelector('.empty-message');
     if (emptyMsg) {
         emptyMsg.remove();
     }
 
+    // Build all messages off-document, then insert them in one go
+    const frag = document.createDocumentFragment();
+    messages.forEach(msg => frag.appendChild(renderMessage(msg)));
+    messagesEl.appendChild(frag);
+
+    // Keep only last 50 messages
+    while (messagesEl.children.length > 50) {
+        messagesEl.removeChild(messagesEl.firstChild);
+    }
+
+    messagesEl.scrollTop = messagesEl.scrollHeight;
+}
+
+function renderMessage(message) {
     const messageDiv = document.createElement('div');
     messageDiv.className = message.forwarded ? 'message forwarded' : 'message';
 
-    const timestamp = new Date(message.timestamp).toLocaleTimeString();
-    const fromNode = message.from.substring(message.from.length - 8);
+    const header = document.createElement('div');
+    header.className = 'message-header';
 
-    messageDiv.innerHTML = `
-        <div class="message-header">
-            <span>From: ${fromNode}</span>
-            <span>${timestamp}</span>
-        </div>
-        <div class="message-text">${escapeHtml(message.text)}</div>
-    `;
+    const fromSpan = document.createElement('span');
+    fromSpan.textContent = `From: ${message.from.slice(-8)}`;
 
-    messagesEl.appendChild(messageDiv);
-    messagesEl.scrollTop = messagesEl.scrollHeight;
+    const timeSpan = document.createElement('span');
+    timeSpan.textContent = timeFormat.format(new Date(message.timestamp));
 
-    // Keep only last 50 messages
-    while (messagesEl.children.length > 50) {
-        messagesEl.removeChild(messagesEl.firstChild);
-    }
+    header.append(fromSpan, timeSpan);
+
+    const textDiv = document.createElement('div');
+    textDiv.className = 'message-text';
+    textDiv.textContent = message.text;
+
+    messageDiv.append(header, textDiv);
+    return messageDiv;
 }
 
-// Load and update statistics
-async function loadStatistics() {
+// Load bridge status and statistics from API
+async function loadState() {
     try {
-        const response = await fetch('/api/statistics');
-        const stats = await response.json();
-        updateStatistics(stats);
+        const response = await fetch('/api/state');
+        const state = await response.json();
+        updateStatistics(state.stats);
     } catch (error) {
-        console.error('Error loading statistics:', error);
+        console.error('Error loading state:', error);
     }
 }
 
@@ -691,18 +1011,6 @@ async function sendMessage() {
         console.error('Error sending message:', error);
         alert('Failed to send message');
     }
-}
-
-// Auto-refresh statistics
-function startAutoRefresh() {
-    setInterval(loadStatistics, 5000); // Refresh every 5 seconds
-}
-
-// Utility function to escape HTML
-function escapeHtml(text) {
-    const div = document.createElement('div');
-    div.textContent = text;
-    return div.innerHTML;
 }'''
 
     # Write files
@@ -715,13 +1023,21 @@ function escapeHtml(text) {
     with open('web/static/js/app.js', 'w') as f:
         f.write(js_content)
 
+    # Pre-compressed copies, served to clients that accept gzip
+    for path, content in (('web/static/css/style.css', css_content),
+                          ('web/static/js/app.js', js_content)):
+        with open(path + '.gz', 'wb') as f:
+            f.write(gzip.compress(content.encode('utf-8'), 9, mtime=0))
+
+    # Stamp last, so an interrupted run is redone on the next start
+    with open(WEB_VERSION_FILE, 'w') as f:
+        f.write(WEB_FILES_VERSION + '\n')
+
     logger.info("Web interface files created")
 
 
 def main():
     """Test web interface"""
-    import time
-
     logging.basicConfig(level=logging.INFO)
 
     # Create web files
@@ -771,8 +1087,8 @@ def main():
     print("Press Ctrl+C to stop...")
 
     try:
-        while True:
-            time.sleep(1)
+        # Nothing else to do until the server exits or Ctrl+C
+        web.server_thread.join()
     except KeyboardInterrupt:
         print("\nStopping...")
         web.stop()